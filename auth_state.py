@@ -0,0 +1,191 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import fasteners
+from urllib.parse import urlsplit
+
+CACHE_DIRECTORY = ".auth_cache"
+
+DUMP_STORAGE_SCRIPT = """
+var dump = function (storage) {
+    var items = {};
+    for (var i = 0; i < storage.length; i++) {
+        var key = storage.key(i);
+        items[key] = storage.getItem(key);
+    }
+    return items;
+};
+return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+
+LOAD_STORAGE_SCRIPT = """
+var state = arguments[0];
+Object.keys(state.local).forEach(function (key) {
+    window.localStorage.setItem(key, state.local[key]);
+});
+Object.keys(state.session).forEach(function (key) {
+    window.sessionStorage.setItem(key, state.session[key]);
+});
+"""
+
+
+class LoginStateCache:
+    """
+    Saves the authenticated browser state after one successful login and
+    restores it into fresh browsers, so later tests and xdist workers skip the
+    login form.
+
+    The state (cookies, localStorage and sessionStorage) is keyed by the base
+    URL and the user name. It is considered expired once its oldest cookie
+    expires or after max_age seconds; expired or rejected state triggers a
+    new login.
+
+    Args:
+        base_url (str): The application URL (BASE_URL).
+        username (str): The user the state belongs to (USERNAME_TEST).
+        max_age (float): Seconds a saved state is trusted.
+        directory (str): Where state files are kept.
+        logger (logging.Logger): Where progress is logged.
+    """
+
+    def __init__(
+        self,
+        base_url,
+        username,
+        max_age=8 * 3600,
+        directory=CACHE_DIRECTORY,
+        logger=None,
+    ):
+        self.base_url = base_url
+        self.username = username
+        self.max_age = max_age
+        self.log = logger or logging.getLogger(__name__)
+        os.makedirs(directory, exist_ok=True)
+        key = hashlib.sha256(f"{base_url}\0{username}".encode()).hexdigest()[:16]
+        self.path = os.path.join(directory, f"{key}.json")
+        self.lock = fasteners.InterProcessLock(self.path + ".lock")
+
+    @property
+    def origin(self):
+        parts = urlsplit(self.base_url)
+        return f"{parts.scheme}://{parts.netloc}/"
+
+    def load(self):
+        """
+        Loads the saved state if it has not expired.
+
+        Returns:
+            dict: The saved state, or None.
+        """
+        try:
+            with open(self.path) as file:
+                state = json.load(file)
+        except (OSError, ValueError):
+            return None
+        now = time.time()
+        if now - state["saved_at"] > self.max_age:
+            self.log.info("Saved login state is too old")
+            return None
+        expiries = [c["expiry"] for c in state["cookies"] if "expiry" in c]
+        if expiries and min(expiries) <= now:
+            self.log.info("Saved login state has expired cookies")
+            return None
+        return state
+
+    def save(self, sb):
+        """
+        Saves the state of a logged-in browser.
+
+        Args:
+            sb (BaseCase): The logged-in test case.
+
+        Returns:
+            None
+        """
+        storage = sb.execute_script(DUMP_STORAGE_SCRIPT)
+        state = {
+            "saved_at": time.time(),
+            "cookies": sb.driver.get_cookies(),
+            "local_storage": storage["local"],
+            "session_storage": storage["session"],
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(state, file)
+        os.replace(tmp_path, self.path)
+        self.log.info(f"Login state saved to {self.path}")
+
+    def invalidate(self):
+        """
+        Deletes the saved state.
+
+        Returns:
+            None
+        """
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def restore(self, sb, verify):
+        """
+        Restores the saved state into a browser.
+
+        Args:
+            sb (BaseCase): The test case with a fresh browser.
+            verify (callable): Returns True once the app shows a logged-in page.
+
+        Returns:
+            bool: True if the browser is logged in.
+        """
+        state = self.load()
+        if state is None:
+            return False
+        sb.open(self.origin)
+        sb.driver.delete_all_cookies()
+        for cookie in state["cookies"]:
+            try:
+                sb.driver.add_cookie(cookie)
+            except Exception as e:
+                self.log.debug(f"Skipping cookie {cookie.get('name')}: {e}")
+        sb.execute_script(
+            LOAD_STORAGE_SCRIPT,
+            {"local": state["local_storage"], "session": state["session_storage"]},
+        )
+        sb.open(self.base_url)
+        if verify():
+            self.log.info("Login state restored from cache")
+            return True
+        self.log.info("Saved login state was rejected by the app")
+        self.invalidate()
+        return False
+
+    def ensure_logged_in(self, sb, login, verify):
+        """
+        Logs the browser in, from the cache when possible.
+
+        Only one worker at a time runs the real login; the others wait for it
+        and then restore the state it saved.
+
+        Args:
+            sb (BaseCase): The test case with a fresh browser.
+            login (callable): Performs the real login.
+            verify (callable): Returns True once the app shows a logged-in page.
+
+        Raises:
+            RuntimeError: If the app does not show a logged-in page after the
+                real login; nothing is saved then.
+
+        Returns:
+            bool: True if the state came from the cache.
+        """
+        if self.restore(sb, verify):
+            return True
+        with self.lock:
+            if self.restore(sb, verify):
+                return True
+            login()
+            if not verify():
+                raise RuntimeError("Login did not reach a logged-in page; state not cached")
+            self.save(sb)
+        return False
@@ -0,0 +1,218 @@
+import time
+import queue
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from seleniumbase import SB
+
+CLEAR_STORAGE_SCRIPT = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+def launch_browser():
+    """
+    Starts a SeleniumBase session outside of a with block.
+
+    Returns:
+        tuple: The session (a BaseCase) and the context manager that closes it.
+    """
+    manager = SB(test=True, log_cdp=True)
+    return manager.__enter__(), manager
+
+
+class BrowserPool:
+    """
+    Keeps browsers launched ahead of time and hands them out to tests.
+
+    Released browsers are reset (extra tabs closed, cookies and storage
+    cleared, about:blank loaded) instead of quit. A browser that cannot be
+    reset is retired and a replacement is launched in the background.
+
+    Browsers are only released by the tests of the same worker, so
+    acquire() fails at once when none is idle and none is being launched.
+    Either a launch failed, or every browser is checked out, e.g. with size
+    1 while the session fixture holds the only browser. Use at least 2.
+
+    Args:
+        size (int): Number of browsers kept per worker.
+        launch (callable): Returns (session, context manager); see
+            launch_browser().
+        logger (logging.Logger): Where metrics are logged.
+    """
+
+    def __init__(self, size=2, launch=launch_browser, logger=None):
+        self.size = size
+        self.launch = launch
+        self.log = logger or logging.getLogger(__name__)
+        self.idle = queue.Queue()
+        self.managers = {}
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.launch_error = None
+        # SeleniumBase keeps its settings in module globals, so launches and
+        # quits are serialised on one background thread.
+        self.executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="browser-pool"
+        )
+        self.launch_seconds = []
+        self.wait_seconds = []
+        self.reset_seconds = []
+
+    def start(self):
+        """
+        Launches the initial browsers in the background.
+
+        Returns:
+            None
+        """
+        for _ in range(self.size):
+            self._submit_launch()
+
+    def _submit_launch(self):
+        with self.lock:
+            self.pending += 1
+        self.executor.submit(self._launch_one)
+
+    def _launch_one(self):
+        start = time.monotonic()
+        try:
+            sb, manager = self.launch()
+        except Exception as e:
+            self.log.error(f"Browser pool failed to launch a browser: {e}")
+            with self.lock:
+                self.launch_error = e
+                self.pending -= 1
+            # Wakes a waiting acquire() so it can report the failure.
+            self.idle.put(None)
+            return
+        self.launch_seconds.append(time.monotonic() - start)
+        self.managers[sb] = manager
+        self.idle.put(sb)
+        with self.lock:
+            self.pending -= 1
+
+    def acquire(self, timeout=120):
+        """
+        Takes a browser from the pool, waiting for a launch if none is idle.
+
+        Args:
+            timeout (float): Seconds to wait for a browser.
+
+        Raises:
+            RuntimeError: If no browser is idle or being launched, with the
+                last launch failure as its cause.
+            TimeoutError: If no browser became available in time.
+
+        Returns:
+            BaseCase: A SeleniumBase session on about:blank.
+        """
+        start = time.monotonic()
+        deadline = start + timeout
+        while True:
+            with self.lock:
+                if self.idle.empty() and not self.pending:
+                    if self.launch_error is not None:
+                        raise RuntimeError(
+                            f"Browser pool cannot launch a browser: {self.launch_error}"
+                        ) from self.launch_error
+                    raise RuntimeError(
+                        f"All {len(self.managers)} pooled browsers are in use; "
+                        "raise BROWSER_POOL_SIZE"
+                    )
+            try:
+                sb = self.idle.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                raise TimeoutError(f"No browser became available within {timeout}s") from None
+            if sb is not None:
+                break
+        self.wait_seconds.append(time.monotonic() - start)
+        return sb
+
+    def reset(self, sb):
+        """
+        Clears the state a test left in a browser.
+
+        Args:
+            sb (BaseCase): The session to reset.
+
+        Returns:
+            None
+        """
+        driver = sb.driver
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.execute_script(CLEAR_STORAGE_SCRIPT)
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        driver.get("about:blank")
+
+    def release(self, sb):
+        """
+        Resets a browser and returns it to the pool.
+
+        Args:
+            sb (BaseCase): The session acquired from the pool.
+
+        Returns:
+            None
+        """
+        start = time.monotonic()
+        try:
+            self.reset(sb)
+        except Exception as e:
+            self.log.warning(f"Browser pool could not reset a browser: {e}")
+            self.retire(sb)
+            return
+        self.reset_seconds.append(time.monotonic() - start)
+        self.idle.put(sb)
+
+    def retire(self, sb):
+        """
+        Quits a browser in the background and launches its replacement.
+
+        Args:
+            sb (BaseCase): The session to quit.
+
+        Returns:
+            None
+        """
+        manager = self.managers.pop(sb, None)
+        if manager is not None:
+            self.executor.submit(self._quit, manager)
+        self._submit_launch()
+
+    def _quit(self, manager):
+        try:
+            manager.__exit__(None, None, None)
+        except Exception as e:
+            self.log.debug(f"Browser pool failed to quit a browser: {e}")
+
+    def close(self):
+        """
+        Quits every browser of the pool.
+
+        Returns:
+            None
+        """
+        self.executor.shutdown(wait=True)
+        for manager in list(self.managers.values()):
+            self._quit(manager)
+        self.managers.clear()
+
+    def report(self):
+        """
+        Logs time spent launching browsers versus waiting for the pool.
+
+        Returns:
+            None
+        """
+        self.log.info(
+            f"Browser pool: {len(self.launch_seconds)} launches took "
+            f"{sum(self.launch_seconds):.2f}s in the background, tests waited "
+            f"{sum(self.wait_seconds):.2f}s over {len(self.wait_seconds)} acquires, "
+            f"resets took {sum(self.reset_seconds):.2f}s"
+        )
@@ -0,0 +1,49 @@
+import time
+import pytest
+from browser_pool import BrowserPool
+
+
+class FakeManager:
+    def __exit__(self, *exc_info):
+        pass
+
+
+def fake_launch():
+    return object(), FakeManager()
+
+
+def failing_launch():
+    raise OSError("chromedriver not found")
+
+
+def test_acquire_reports_launch_failures_at_once():
+    pool = BrowserPool(2, launch=failing_launch)
+    pool.start()
+    start = time.monotonic()
+    with pytest.raises(RuntimeError, match="chromedriver not found") as error:
+        pool.acquire(timeout=30)
+    assert isinstance(error.value.__cause__, OSError)
+    assert time.monotonic() - start < 10
+    pool.close()
+
+
+def test_acquire_fails_when_every_browser_is_checked_out():
+    pool = BrowserPool(1, launch=fake_launch)
+    pool.start()
+    held = pool.acquire(timeout=30)
+    assert held is not None
+    with pytest.raises(RuntimeError, match="BROWSER_POOL_SIZE"):
+        pool.acquire(timeout=30)
+    pool.close()
+
+
+def test_acquire_waits_for_launches_in_progress():
+    def slow_launch():
+        time.sleep(0.2)
+        return fake_launch()
+
+    pool = BrowserPool(2, launch=slow_launch)
+    pool.start()
+    assert pool.acquire(timeout=30) is not pool.acquire(timeout=30)
+    assert len(pool.wait_seconds) == 2
+    pool.close()
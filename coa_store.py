@@ -0,0 +1,461 @@
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from hierarchy import AccountHierarchy
+from ngram_index import NGramIndex
+
+STRING_FIELDS = (
+    "id",
+    "fundId",
+    "name",
+    "state",
+    "parentId",
+    "description",
+    "attributeId",
+    "fsMappingId",
+    "fsDisplayName",
+    "postDate",
+)
+BOOLEAN_FIELDS = ("isTaxable", "isEntityRequired", "doNotMap")
+HASH_INDEXED_FIELDS = (
+    "id",
+    "state",
+    "fsDisplayName",
+    "attributeId",
+    "parentId",
+    "fsMappingId",
+)
+# Fields holding a UUID per account, stored as 16 bytes instead of interned
+# strings. fundId, attributeId and fsMappingId repeat a handful of values, so
+# a 4-byte code into their distinct values is smaller still.
+UUID_FIELDS = ("id", "parentId")
+MISSING = -1
+EMPTY = -1
+NIL = bytes(16)
+
+
+def uuid_key(value):
+    """
+    Returns the 16-byte form of a UUID string.
+
+    Strings that are not UUIDs in canonical (lower-case, hyphenated) form get
+    NIL followed by their UTF-8 bytes, so they still round-trip and never
+    collide with a UUID.
+
+    Args:
+        value (str): The value.
+
+    Returns:
+        bytes: The key.
+    """
+    key = NIL
+    canonical = len(value) == 36 and value[8] == value[13] == value[18] == value[23] == "-"
+    if canonical and value == value.lower():
+        try:
+            key = bytes.fromhex(value.replace("-", ""))
+        except ValueError:
+            pass
+    if len(key) != len(NIL) or key == NIL:
+        return NIL + value.encode("utf-8")
+    return key
+
+
+def uuid_value(key):
+    """
+    Returns the string a uuid_key() was made from.
+
+    Args:
+        key (bytes): The key.
+
+    Returns:
+        str: The value.
+    """
+    if len(key) > len(NIL):
+        return str(key[len(NIL) :], "utf-8")
+    digits = key.hex()
+    return f"{digits[:8]}-{digits[8:12]}-{digits[12:16]}-{digits[16:20]}-{digits[20:]}"
+
+
+class StringColumn:
+    """
+    A column of strings stored as int codes into a table of distinct values.
+
+    None and absent values are stored as MISSING.
+    """
+
+    def __init__(self):
+        self.codes = array("i")
+        self.values = []
+        self.lookup = {}
+
+    def append(self, value):
+        if value is None:
+            self.codes.append(MISSING)
+            return
+        code = self.lookup.get(value)
+        if code is None:
+            code = len(self.values)
+            self.lookup[value] = code
+            self.values.append(value)
+        self.codes.append(code)
+
+    def __getitem__(self, row):
+        code = self.codes[row]
+        return None if code == MISSING else self.values[code]
+
+    def code_of(self, value):
+        return self.lookup.get(value)
+
+
+class UuidColumn:
+    """
+    A column of UUID strings stored as 16 bytes per row.
+
+    None and absent values are stored as NIL; values that are not canonical
+    UUIDs are kept as strings in others, by row.
+    """
+
+    def __init__(self):
+        self.data = bytearray()
+        self.others = {}
+
+    def __len__(self):
+        return len(self.data) // len(NIL)
+
+    def append(self, value):
+        if value is None:
+            self.data += NIL
+            return
+        key = uuid_key(value)
+        if len(key) > len(NIL):
+            self.others[len(self)] = value
+            key = NIL
+        self.data += key
+
+    def key(self, row):
+        """
+        Returns the uuid_key() of a row's value.
+
+        Args:
+            row (int): The row.
+
+        Returns:
+            bytes: The key, or NIL if the row has no value.
+        """
+        key = bytes(self.data[row * 16 : row * 16 + 16])
+        if key == NIL and row in self.others:
+            return NIL + self.others[row].encode("utf-8")
+        return key
+
+    def __getitem__(self, row):
+        key = self.key(row)
+        return None if key == NIL else uuid_value(key)
+
+    def as_strings(self):
+        """
+        Returns the column dictionary-encoded, e.g. to write it to a snapshot.
+
+        Returns:
+            StringColumn: The same values.
+        """
+        column = StringColumn()
+        for row in range(len(self)):
+            column.append(self[row])
+        return column
+
+
+class UuidIndex:
+    """
+    The row of each value of a UuidColumn, as an open addressing hash table
+    of rows (crc32, linear probing) that holds no key objects: a probe
+    compares against the column itself. Where a value repeats, the first row
+    is found.
+
+    Args:
+        column (UuidColumn): The values.
+    """
+
+    def __init__(self, column):
+        self.column = column
+        self.table = array("i", [EMPTY]) * 8
+        self.count = 0
+
+    def add(self, row):
+        """
+        Adds a row; rows without a value are skipped.
+
+        Args:
+            row (int): The row.
+
+        Returns:
+            None
+        """
+        if self.column.key(row) == NIL:
+            return
+        self.count += 1
+        if 2 * self.count > len(self.table):
+            rows = [row for row in self.table if row != EMPTY]
+            self.table = array("i", [EMPTY]) * (2 * len(self.table))
+            for previous in sorted(rows):
+                self._insert(previous)
+        self._insert(row)
+
+    def _insert(self, row):
+        mask = len(self.table) - 1
+        slot = zlib.crc32(self.column.key(row)) & mask
+        while self.table[slot] != EMPTY:
+            slot = (slot + 1) & mask
+        self.table[slot] = row
+
+    def get(self, value):
+        """
+        Returns the row of a value.
+
+        Args:
+            value (str): The value.
+
+        Returns:
+            int: The first row holding it, or None if no row does.
+        """
+        key = uuid_key(value)
+        mask = len(self.table) - 1
+        slot = zlib.crc32(key) & mask
+        while True:
+            row = self.table[slot]
+            if row == EMPTY or self.column.key(row) == key:
+                return None if row == EMPTY else row
+            slot = (slot + 1) & mask
+
+
+class FlagColumn:
+    """
+    One of the boolean fields, read out of the flag bits shared by all of
+    them.
+
+    Args:
+        flags (bytearray): One byte of flags per row.
+        bit (int): The bit of this field.
+    """
+
+    def __init__(self, flags, bit):
+        self.flags = flags
+        self.bit = bit
+
+    def __len__(self):
+        return len(self.flags)
+
+    def __getitem__(self, row):
+        return self.flags[row] >> self.bit & 1
+
+    def __iter__(self):
+        return (flags >> self.bit & 1 for flags in self.flags)
+
+
+class ChartOfAccountsStore:
+    """
+    Columnar, indexed in-memory model of a chart of accounts.
+
+    Each field is kept as a typed array: UUIDs as 16 bytes, other strings as
+    interned codes and the booleans as bits of one byte per account. There
+    are hash indexes on the filterable fields, a single id -> row table and a
+    sorted index on ``number``, so lookups cost O(result) instead of a scan
+    over every account dict.
+    """
+
+    def __init__(self):
+        self.size = 0
+        self.numbers = array("q")
+        self.flags = bytearray()
+        self.booleans = {
+            field: FlagColumn(self.flags, bit) for bit, field in enumerate(BOOLEAN_FIELDS)
+        }
+        self.strings = {
+            field: UuidColumn() if field in UUID_FIELDS else StringColumn()
+            for field in STRING_FIELDS
+        }
+        self.id_rows = UuidIndex(self.strings["id"])
+        self.indexes = {field: {} for field in HASH_INDEXED_FIELDS if field != "id"}
+        self.sorted_rows = None
+        self.sorted_numbers = None
+
+    @classmethod
+    def from_items(cls, items):
+        """
+        Builds a store from account dicts.
+
+        Args:
+            items (iterable): Account dicts, e.g. mock_data.data["items"].
+
+        Returns:
+            ChartOfAccountsStore: The populated store.
+        """
+        store = cls()
+        for item in items:
+            store.append(item)
+        store.build_sorted_index()
+        return store
+
+    def append(self, item):
+        """
+        Adds one account. Call build_sorted_index() after the last one.
+
+        Args:
+            item (dict): The account.
+
+        Returns:
+            int: The row of the account.
+        """
+        row = self.size
+        self.numbers.append(item["number"])
+        flags = 0
+        for bit, field in enumerate(BOOLEAN_FIELDS):
+            if item.get(field):
+                flags |= 1 << bit
+        self.flags.append(flags)
+        for field in STRING_FIELDS:
+            self.strings[field].append(item.get(field))
+        self.id_rows.add(row)
+        for field, index in self.indexes.items():
+            value = item.get(field)
+            if value is not None:
+                key = self.strings[field].key(row) if field in UUID_FIELDS else value
+                index.setdefault(key, array("i")).append(row)
+        self.size += 1
+        self.sorted_rows = None
+        return row
+
+    def build_sorted_index(self):
+        """
+        Builds the sorted index on number.
+
+        Returns:
+            None
+        """
+        order = sorted(range(self.size), key=self.numbers.__getitem__)
+        self.sorted_rows = array("i", order)
+        self.sorted_numbers = array("q", (self.numbers[row] for row in order))
+
+    def build_hierarchy(self, logger=None):
+        """
+        Builds the parentId hierarchy of the accounts.
+
+        Args:
+            logger (logging.Logger): Where orphans and cycles are reported.
+
+        Returns:
+            AccountHierarchy: The hierarchy.
+        """
+        return AccountHierarchy(self, logger)
+
+    def build_search_index(self):
+        """
+        Builds the name/number search index of the accounts.
+
+        Returns:
+            NGramIndex: The index.
+        """
+        return NGramIndex(self)
+
+    def __len__(self):
+        return self.size
+
+    def index_key(self, field, value):
+        return uuid_key(value) if field in UUID_FIELDS else value
+
+    def value(self, field, row):
+        """
+        Returns one field of one account.
+
+        Args:
+            field (str): The field name.
+            row (int): The row of the account.
+
+        Returns:
+            The value, or None if the account has none.
+        """
+        if field == "number":
+            return self.numbers[row]
+        if field in self.booleans:
+            return bool(self.booleans[field][row])
+        return self.strings[field][row]
+
+    def row(self, row):
+        """
+        Returns an account as a dict.
+
+        Args:
+            row (int): The row of the account.
+
+        Returns:
+            dict: The account fields; absent optional fields are omitted.
+        """
+        item = {"number": self.numbers[row]}
+        for field in BOOLEAN_FIELDS:
+            item[field] = bool(self.booleans[field][row])
+        for field, column in self.strings.items():
+            value = column[row]
+            if value is not None or field in ("parentId", "postDate"):
+                item[field] = value
+        return item
+
+    def rows_where(self, field, value):
+        """
+        Returns the rows whose field equals a value, through its hash index.
+
+        Args:
+            field (str): One of HASH_INDEXED_FIELDS.
+            value (str): The value to match.
+
+        Returns:
+            array: The matching rows.
+        """
+        if field == "id":
+            row = self.id_rows.get(value)
+            return array("i", [] if row is None else [row])
+        return self.indexes[field].get(self.index_key(field, value), array("i"))
+
+    def distinct(self, field):
+        """
+        Returns the distinct values of a hash-indexed field.
+
+        Args:
+            field (str): One of HASH_INDEXED_FIELDS.
+
+        Returns:
+            list: The values, in no particular order.
+        """
+        if field == "id":
+            ids = map(self.strings["id"].__getitem__, range(self.size))
+            return [value for value in dict.fromkeys(ids) if value is not None]
+        if field in UUID_FIELDS:
+            return [uuid_value(key) for key in self.indexes[field]]
+        return list(self.indexes[field])
+
+    def rows_in_number_range(self, low, high):
+        """
+        Returns the rows whose number lies in [low, high], in number order.
+
+        Args:
+            low (int): Smallest number included.
+            high (int): Largest number included.
+
+        Returns:
+            array: The matching rows.
+        """
+        if self.sorted_rows is None:
+            self.build_sorted_index()
+        start = bisect_left(self.sorted_numbers, low)
+        end = bisect_right(self.sorted_numbers, high)
+        return self.sorted_rows[start:end]
+
+    def row_of_id(self, account_id):
+        """
+        Returns the row of an account id.
+
+        Args:
+            account_id (str): The account id.
+
+        Returns:
+            int: The row, or None if the id is unknown.
+        """
+        return self.id_rows.get(account_id)
@@ -0,0 +1,74 @@
+import pytest
+import dataset
+from coa_store import HASH_INDEXED_FIELDS, ChartOfAccountsStore
+
+
+@pytest.fixture(scope="module")
+def items():
+    return list(dataset.stream())
+
+
+@pytest.fixture(scope="module")
+def store(items):
+    return ChartOfAccountsStore.from_items(items)
+
+
+def test_rows_round_trip(items, store):
+    assert len(store) == len(items)
+    for row, item in enumerate(items):
+        account = store.row(row)
+        for field, value in item.items():
+            assert account.get(field) == value, field
+
+
+def test_hash_indexes_match_a_scan(items, store):
+    for field in HASH_INDEXED_FIELDS:
+        values = {item.get(field) for item in items} - {None}
+        assert set(store.distinct(field)) == values
+        for value in values:
+            expected = [row for row, item in enumerate(items) if item.get(field) == value]
+            assert list(store.rows_where(field, value)) == expected
+        assert len(store.rows_where(field, "no such value")) == 0
+
+
+def test_number_range(items, store):
+    numbers = sorted(item["number"] for item in items)
+    low, high = numbers[10], numbers[60]
+    rows = store.rows_in_number_range(low, high)
+    assert [store.numbers[row] for row in rows] == [n for n in numbers if low <= n <= high]
+    assert len(store.rows_in_number_range(high + 1, low - 1)) == 0
+
+
+def test_row_of_id(items, store):
+    for row, item in enumerate(items):
+        assert store.row_of_id(item["id"]) == row
+    assert store.row_of_id("no such id") is None
+
+
+def test_appending_invalidates_the_sorted_index():
+    store = ChartOfAccountsStore()
+    store.append({"id": "b", "number": 20})
+    assert list(store.rows_in_number_range(0, 100)) == [0]
+    store.append({"id": "a", "number": 10})
+    assert list(store.rows_in_number_range(0, 100)) == [1, 0]
+    assert store.value("isTaxable", 0) is False
+    assert store.value("parentId", 0) is None
+    assert store.row_of_id("a") == 1
+
+
+def test_uuid_columns_and_flags_are_packed(items, store):
+    assert len(store.strings["id"].data) == 16 * len(items)
+    assert len(store.strings["parentId"].data) == 16 * len(items)
+    assert len(store.flags) == len(items)
+    upper = "18C0761C-88C7-4781-AC69-BB5532427B47"
+    store = ChartOfAccountsStore.from_items(
+        [{"id": upper, "number": 1, "doNotMap": True}, {"id": "x", "parentId": upper, "number": 2}]
+    )
+    assert store.row(0)["id"] == upper
+    assert store.row(1)["parentId"] == upper
+    assert store.rows_where("parentId", upper).tolist() == [1]
+    assert [store.value(field, 0) for field in ("isTaxable", "isEntityRequired", "doNotMap")] == [
+        False,
+        False,
+        True,
+    ]
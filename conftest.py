@@ -0,0 +1 @@
+pytest_plugins = ["lpt_scheduler", "stand_in_plugin", "fault_proxy"]
@@ -1,6 +1,7 @@
 # constants.py
 
 CLIENT_NAME = "Lamdi"
+FUND_NAME = "De Buyer"
 ACCOUNT_NAME_TO_SEARCH = "Cash Checking"
 NUMBER_TO_SEARCH = "1010000"
 
@@ -10,8 +11,42 @@ COLUMN_ATTRIBUTE_FILTER = "column-header-filter-3"
 COLUMN_FINANCIAL_STATEMENT_FILTER = "column-header-filter-7"
 COLUMN_STATUS_FILTER = "column-header-filter-9"
 
+# Header text of the filtered columns, as the extracted grid rows are keyed
+COLUMN_HEADERS = {
+    COLUMN_ARK_TRANSACTION_FILTER: "ARK Transaction",
+    COLUMN_ATTRIBUTE_FILTER: "Attribute",
+    COLUMN_FINANCIAL_STATEMENT_FILTER: "Financial Statement",
+    COLUMN_STATUS_FILTER: "Status",
+}
+
 # Filter Values
 ARK_TRANSACTION_FILTER_VALUE = "General Expense"
 ATTRIBUTE_FILTER_VALUE = "Gain/Loss - Income Statement"
 FINANCIAL_STATEMENT_FILTER_VALUE = "Cash and Cash Equivalents"
 STATUS_FILTER_VALUE = "POSTED"
+
+# Test cases
+SEARCH_TERMS = [ACCOUNT_NAME_TO_SEARCH, NUMBER_TO_SEARCH]
+COLUMN_FILTERS = [
+    (COLUMN_ARK_TRANSACTION_FILTER, ARK_TRANSACTION_FILTER_VALUE),
+    (COLUMN_ATTRIBUTE_FILTER, ATTRIBUTE_FILTER_VALUE),
+    (COLUMN_FINANCIAL_STATEMENT_FILTER, FINANCIAL_STATEMENT_FILTER_VALUE),
+    (COLUMN_STATUS_FILTER, STATUS_FILTER_VALUE),
+]
+
+# Result oracle
+# attributeId -> label shown in the Attribute column (needed to check that filter)
+ATTRIBUTE_LABELS = {}
+# attributeId -> type shown in the ARK Transaction column (needed to check that filter)
+ARK_TRANSACTION_LABELS = {}
+
+# Network idle waits (regexes matched against request URLs)
+NETWORK_IDLE_INCLUDE = []
+NETWORK_IDLE_EXCLUDE = [
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"segment\.(io|com)",
+    r"hotjar\.com",
+    r"sentry\.io",
+    r"/notifications/poll",
+]
@@ -0,0 +1,94 @@
+import os
+import ast
+import sys
+import marshal
+import hashlib
+import functools
+import ndjson
+
+SOURCE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "mock_data.py")
+CACHE_DIRECTORY = os.path.join(os.path.dirname(SOURCE_PATH), ".dataset_cache")
+
+
+def parse(source):
+    """
+    Reads the ``data = {...}`` literal of a dataset module without running it.
+
+    Args:
+        source (bytes): The module source.
+
+    Raises:
+        ValueError: If the module has no ``data`` assignment.
+
+    Returns:
+        dict: The dataset.
+    """
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == "data"
+            for target in node.targets
+        ):
+            return ast.literal_eval(node.value)
+    raise ValueError("No 'data = ...' assignment in dataset source")
+
+
+@functools.lru_cache(maxsize=None)
+def load(source_path=SOURCE_PATH, cache_directory=CACHE_DIRECTORY):
+    """
+    Returns the dataset, parsing the source only when its compiled cache is
+    missing or stale.
+
+    The cache is a marshal file named after the source's content hash (and
+    the interpreter, since the marshal format is version specific). It is
+    written atomically, so concurrent xdist workers never read a partial file.
+
+    Args:
+        source_path (str): The dataset module, mock_data.py by default.
+        cache_directory (str): Where compiled datasets are kept.
+
+    Returns:
+        dict: The dataset; treat it as read-only, it is shared by all callers.
+    """
+    with open(source_path, "rb") as file:
+        source = file.read()
+    digest = hashlib.sha256(source).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(source_path))[0]
+    cache_path = os.path.join(
+        cache_directory, f"{name}-{digest}.{sys.implementation.cache_tag}.marshal"
+    )
+    try:
+        with open(cache_path, "rb") as file:
+            return marshal.load(file)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    data = parse(source)
+    os.makedirs(cache_directory, exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as file:
+        marshal.dump(data, file)
+    os.replace(tmp_path, cache_path)
+    return data
+
+
+def items():
+    """
+    Returns the accounts of the default dataset.
+
+    Returns:
+        list: The account dicts of mock_data.py.
+    """
+    return load()["items"]
+
+
+def stream(path=None):
+    """
+    Yields accounts one at a time, from an NDJSON export or the default
+    dataset.
+
+    Args:
+        path (str): An NDJSON (or .ndjson.gz) export; mock_data.py if None.
+
+    Returns:
+        iterator: The account dicts.
+    """
+    return iter(items()) if path is None else ndjson.read(path)
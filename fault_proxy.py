@@ -0,0 +1,541 @@
+import os
+import re
+import json
+import math
+import time
+import base64
+import random
+import hashlib
+import logging
+import argparse
+import threading
+from urllib.parse import urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+import ndjson
+
+SCENARIO_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios")
+HOP_BY_HOP = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+}
+# Not forwarded either way: the proxy sets its own Host and Content-Length and
+# always sends identity-encoded bodies.
+REWRITTEN = {"host", "content-length", "content-encoding", "accept-encoding"}
+DOMAIN_ATTRIBUTE = re.compile(r";\s*domain=[^;]*", re.IGNORECASE)
+# Recorded responses must not carry live credentials: cookie values and
+# JSON fields with these names are replaced by REDACTED.
+SECRET_FIELD = re.compile(r"token|secret|password|session|api.?key", re.IGNORECASE)
+REDACTED = "REDACTED"
+
+log = logging.getLogger(__name__)
+
+
+class RouteProfile:
+    """
+    The faults injected into the requests matching one scenario route.
+
+    Args:
+        match (str): Regex searched in the request path (with query).
+        methods (list): HTTP methods the route applies to; all if empty.
+        latency (dict): Delay before the response, one of
+            {"distribution": "fixed", "ms": 100},
+            {"distribution": "uniform", "min_ms": 50, "max_ms": 500},
+            {"distribution": "normal", "mean_ms": 200, "stddev_ms": 50},
+            {"distribution": "lognormal", "median_ms": 300, "sigma": 0.5}.
+        jitter_ms (float): Uniform noise of up to this many ms either way.
+        bandwidth_kbps (float): Cap on the response body throughput.
+        error_rate (float): Share of requests answered with error_status
+            instead of reaching the backend.
+        error_status (int): Status of the injected errors.
+        drop_rate (float): Share of requests whose connection is closed
+            without any response.
+
+    Raises:
+        ValueError: If the latency distribution is unknown.
+    """
+
+    DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+    def __init__(
+        self,
+        match=".*",
+        methods=(),
+        latency=None,
+        jitter_ms=0,
+        bandwidth_kbps=None,
+        error_rate=0.0,
+        error_status=503,
+        drop_rate=0.0,
+    ):
+        self.pattern = re.compile(match)
+        self.methods = {method.upper() for method in methods}
+        self.latency = latency or {"distribution": "fixed", "ms": 0}
+        if self.latency.get("distribution") not in self.DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution: {self.latency}")
+        self.jitter_ms = jitter_ms
+        self.bandwidth_kbps = bandwidth_kbps
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.drop_rate = drop_rate
+
+    def matches(self, method, path):
+        return (not self.methods or method in self.methods) and bool(
+            self.pattern.search(path)
+        )
+
+    def delay(self, rng):
+        """
+        Draws the delay of one response.
+
+        Args:
+            rng (random.Random): The scenario's random generator.
+
+        Returns:
+            float: Seconds to wait.
+        """
+        latency = self.latency
+        distribution = latency["distribution"]
+        if distribution == "fixed":
+            ms = latency["ms"]
+        elif distribution == "uniform":
+            ms = rng.uniform(latency["min_ms"], latency["max_ms"])
+        elif distribution == "normal":
+            ms = rng.gauss(latency["mean_ms"], latency["stddev_ms"])
+        else:
+            ms = latency["median_ms"] * math.exp(rng.gauss(0, latency["sigma"]))
+        if self.jitter_ms:
+            ms += rng.uniform(-self.jitter_ms, self.jitter_ms)
+        return max(ms, 0) / 1000
+
+
+class Scenario:
+    """
+    A set of route profiles; the first route matching a request applies and
+    requests matching none pass through untouched.
+
+    Args:
+        routes (list): RouteProfile objects, in priority order.
+        seed (int): Seed of the random generator, for repeatable runs.
+        name (str): Shown in the logs.
+    """
+
+    def __init__(self, routes=(), seed=None, name="pass-through"):
+        self.routes = list(routes)
+        self.name = name
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a scenario file, e.g. one of scenarios/*.json.
+
+        A bare name is looked up in the scenarios directory.
+
+        Args:
+            path (str): The JSON file or scenario name.
+
+        Returns:
+            Scenario: The scenario.
+        """
+        if not os.path.exists(path):
+            path = os.path.join(SCENARIO_DIRECTORY, f"{path}.json")
+        with open(path) as file:
+            spec = json.load(file)
+        return cls(
+            [RouteProfile(**route) for route in spec.get("routes", [])],
+            spec.get("seed"),
+            spec.get("name", os.path.splitext(os.path.basename(path))[0]),
+        )
+
+    def profile_for(self, method, path):
+        for route in self.routes:
+            if route.matches(method, path):
+                return route
+        return None
+
+    def draw(self, profile):
+        """
+        Decides what happens to one request.
+
+        Args:
+            profile (RouteProfile): The matching route.
+
+        Returns:
+            tuple: The fault ("drop", "error" or None) and the delay in seconds.
+        """
+        with self.lock:
+            roll = self.rng.random()
+            delay = profile.delay(self.rng)
+        if roll < profile.drop_rate:
+            return "drop", delay
+        if roll < profile.drop_rate + profile.error_rate:
+            return "error", delay
+        return None, delay
+
+
+def redact_fields(value):
+    if isinstance(value, dict):
+        return {
+            name: REDACTED
+            if SECRET_FIELD.search(name) and isinstance(field, str)
+            else redact_fields(field)
+            for name, field in value.items()
+        }
+    if isinstance(value, list):
+        return [redact_fields(item) for item in value]
+    return value
+
+
+def redact(headers, body):
+    """
+    Strips the credentials from a response before it is recorded.
+
+    Set-Cookie values and the string fields of JSON bodies whose names look
+    like credentials (token, password, session, ...) are replaced by
+    REDACTED; cookie attributes and everything else are kept, so replaying
+    still works.
+
+    Args:
+        headers (list): [name, value] pairs.
+        body (bytes): The response body.
+
+    Returns:
+        tuple: The redacted headers and body.
+    """
+    redacted = []
+    for name, value in headers:
+        lowered = name.lower()
+        if lowered == "set-cookie":
+            cookie, separator, attributes = value.partition(";")
+            value = f"{cookie.partition('=')[0]}={REDACTED}{separator}{attributes}"
+        elif lowered in ("authorization", "proxy-authorization") or SECRET_FIELD.search(name):
+            value = REDACTED
+        redacted.append([name, value])
+    content_types = [value for name, value in headers if name.lower() == "content-type"]
+    if body and content_types and "json" in content_types[0]:
+        try:
+            body = json.dumps(redact_fields(json.loads(body))).encode("utf-8")
+        except ValueError:
+            pass
+    return redacted, body
+
+
+class Recording:
+    """
+    Backend responses stored as NDJSON, one exchange per line.
+
+    In record mode every proxied exchange is appended, with its credentials
+    redacted (see redact()). Request bodies are only stored as a digest in
+    the key, but the account data of the responses is stored as is, so keep
+    recordings out of version control. In replay mode
+    requests are answered from the file: exchanges with the same method,
+    path and body are served in recorded order, the last one repeating.
+
+    Args:
+        path (str): The recording file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.exchanges = {}
+        self.served = {}
+
+    @staticmethod
+    def key(method, path, body):
+        return f"{method} {path} {hashlib.sha256(body).hexdigest()[:16]}"
+
+    def load(self):
+        for exchange in ndjson.read(self.path):
+            self.exchanges.setdefault(exchange["key"], []).append(exchange)
+        return self
+
+    def append(self, key, status, headers, body):
+        headers, body = redact(headers, body)
+        exchange = {
+            "key": key,
+            "status": status,
+            "headers": headers,
+            "body": base64.b64encode(body).decode("ascii"),
+        }
+        with self.lock:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(json.dumps(exchange, separators=(",", ":")) + "\n")
+
+    def replay(self, key):
+        """
+        Returns the recorded response to a request.
+
+        Args:
+            key (str): The request key.
+
+        Returns:
+            tuple: Status, headers and body, or None if it was not recorded.
+        """
+        exchanges = self.exchanges.get(key)
+        if not exchanges:
+            return None
+        with self.lock:
+            index = self.served.get(key, 0)
+            self.served[key] = index + 1
+        exchange = exchanges[min(index, len(exchanges) - 1)]
+        return exchange["status"], exchange["headers"], base64.b64decode(exchange["body"])
+
+
+class FaultProxyHandler(BaseHTTPRequestHandler):
+    """
+    Forwards every request to the upstream (or the recording) and injects
+    the delays, errors, drops and bandwidth caps of the server's scenario.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.proxy()
+
+    do_POST = do_PUT = do_PATCH = do_DELETE = do_OPTIONS = do_HEAD = do_GET
+
+    def count(self, name, amount=1):
+        with self.server.stats_lock:
+            self.server.stats[name] += amount
+
+    def proxy(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        profile = server.scenario.profile_for(self.command, self.path)
+        fault, delay = server.scenario.draw(profile) if profile else (None, 0)
+        if fault == "drop":
+            self.count("dropped")
+            self.close_connection = True
+            return
+        time.sleep(delay)
+        self.count("delayed_seconds", delay)
+        if fault == "error":
+            self.count("errors")
+            self.respond(
+                profile.error_status,
+                [["Content-Type", "application/json"]],
+                json.dumps({"error": "injected by fault proxy"}).encode(),
+            )
+            return
+        key = Recording.key(self.command, self.path, body)
+        if server.replaying:
+            response = server.recording.replay(key)
+            if response is None:
+                self.count("not_recorded")
+                self.respond(
+                    502,
+                    [["Content-Type", "application/json"]],
+                    json.dumps({"error": f"not recorded: {key}"}).encode(),
+                )
+                return
+            status, headers, payload = response
+        else:
+            status, headers, payload = self.forward(body)
+            if server.recording is not None:
+                server.recording.append(key, status, headers, payload)
+        self.respond(status, headers, payload, profile)
+
+    def forward(self, body):
+        headers = {
+            name: value
+            for name, value in self.headers.items()
+            if name.lower() not in HOP_BY_HOP | REWRITTEN
+        }
+        try:
+            response = self.server.session.request(
+                self.command,
+                self.server.upstream + self.path,
+                headers=headers,
+                data=body,
+                allow_redirects=False,
+                timeout=60,
+            )
+        except requests.RequestException as e:
+            log.warning(f"Upstream request {self.command} {self.path} failed: {e}")
+            return 502, [["Content-Type", "application/json"]], json.dumps(
+                {"error": f"upstream unreachable: {e}"}
+            ).encode()
+        forwarded = []
+        for name, value in response.headers.items():
+            lowered = name.lower()
+            if lowered in HOP_BY_HOP | REWRITTEN or lowered == "set-cookie":
+                continue
+            if lowered == "location" and value.startswith(self.server.upstream):
+                value = value[len(self.server.upstream) :] or "/"
+            forwarded.append([name, value])
+        # Cookies keep their attributes but lose the upstream Domain, so the
+        # browser stores them for the proxy's origin.
+        for cookie in response.raw.headers.getlist("Set-Cookie"):
+            forwarded.append(["Set-Cookie", DOMAIN_ATTRIBUTE.sub("", cookie)])
+        return response.status_code, forwarded, response.content
+
+    def respond(self, status, headers, payload, profile=None):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        if self.command == "HEAD":
+            return
+        bandwidth = profile.bandwidth_kbps if profile else None
+        if not bandwidth:
+            self.wfile.write(payload)
+            return
+        bytes_per_second = bandwidth * 1000 / 8
+        chunk = max(1024, int(bytes_per_second / 20))
+        for start in range(0, len(payload), chunk):
+            part = payload[start : start + chunk]
+            self.wfile.write(part)
+            self.wfile.flush()
+            time.sleep(len(part) / bytes_per_second)
+
+
+def serve(upstream=None, scenario=None, record=None, replay=None, host="127.0.0.1", port=0):
+    """
+    Starts the fault injection proxy on a background thread.
+
+    Args:
+        upstream (str): The backend URL (e.g. BASE_URL or the stand-in).
+            Not needed when replaying.
+        scenario (Scenario): The faults to inject; pass-through if None.
+        record (str): Append every backend exchange to this NDJSON file.
+        replay (str): Answer from this recording instead of a backend.
+        host (str): Interface to bind.
+        port (int): Port to bind; 0 picks a free one.
+
+    Raises:
+        ValueError: If neither an upstream nor a recording to replay is given,
+            or if recording and replaying are both asked for.
+
+    Returns:
+        ThreadingHTTPServer: The running proxy; its URL is server.url and its
+            injected fault counts are server.stats.
+    """
+    if record and replay:
+        raise ValueError("Cannot record and replay at the same time")
+    if not upstream and not replay:
+        raise ValueError("An upstream URL is needed unless replaying a recording")
+    server = ThreadingHTTPServer((host, port), FaultProxyHandler)
+    server.daemon_threads = True
+    if upstream:
+        parts = urlsplit(upstream)
+        server.upstream = f"{parts.scheme}://{parts.netloc}"
+    else:
+        server.upstream = None
+    server.scenario = scenario or Scenario()
+    server.replaying = bool(replay)
+    server.recording = None
+    if replay:
+        server.recording = Recording(replay).load()
+    elif record:
+        server.recording = Recording(record)
+    server.session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=0)
+    server.session.mount("http://", adapter)
+    server.session.mount("https://", adapter)
+    server.stats = {"dropped": 0, "errors": 0, "not_recorded": 0, "delayed_seconds": 0.0}
+    server.stats_lock = threading.Lock()
+    server.url = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("fault proxy")
+    group.addoption(
+        "--fault-scenario",
+        help="route the browser through a fault injection proxy using this "
+        f"scenario file or name from {os.path.basename(SCENARIO_DIRECTORY)}/",
+    )
+    group.addoption(
+        "--proxy-record", help="record the backend responses to this NDJSON file"
+    )
+    group.addoption(
+        "--proxy-replay", help="answer from this recording instead of BASE_URL"
+    )
+
+
+# Runs after the stand-in plugin, so --stand-in and the proxy can be combined.
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config):
+    scenario = config.getoption("fault_scenario")
+    record = config.getoption("proxy_record")
+    replay = config.getoption("proxy_replay")
+    if not (scenario or record or replay) or hasattr(config, "workerinput"):
+        return
+    load_dotenv()
+    upstream = os.getenv("BASE_URL")
+    server = serve(
+        None if replay else upstream,
+        Scenario.load(scenario) if scenario else None,
+        record,
+        replay,
+    )
+    # Same-origin requests (pages, the API under BASE_URL, the HTTP login)
+    # go through the proxy; requests to other origins do not.
+    parts = urlsplit(upstream or "")
+    origin = f"{parts.scheme}://{parts.netloc}"
+    auth_url = os.getenv("AUTH_URL")
+    if not auth_url:
+        os.environ["AUTH_URL"] = f"{server.url}{parts.path.rstrip('/')}/api/auth/login"
+    elif upstream and auth_url.startswith(origin):
+        os.environ["AUTH_URL"] = server.url + auth_url[len(origin) :]
+    os.environ["BASE_URL"] = server.url + parts.path
+    config.fault_proxy = server
+
+
+def pytest_unconfigure(config):
+    server = getattr(config, "fault_proxy", None)
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+        log.info(f"Fault proxy ({server.scenario.name}): {server.stats}")
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    server = getattr(config, "fault_proxy", None)
+    if server is not None:
+        stats = server.stats
+        line = (
+            f"Fault proxy ({server.scenario.name}): {stats['errors']} errors, "
+            f"{stats['dropped']} drops, {stats['delayed_seconds']:.1f}s of added latency"
+        )
+        if server.replaying:
+            line += f", {stats['not_recorded']} requests missing from the recording"
+        terminalreporter.write_line(line)
+
+
+if __name__ == "__main__":
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Latency and fault injection proxy.")
+    parser.add_argument("--upstream", default=os.getenv("BASE_URL"), help="Backend URL")
+    parser.add_argument("--scenario", help="Scenario file or name")
+    parser.add_argument("--record", help="Record the backend responses to this file")
+    parser.add_argument("--replay", help="Answer from this recording")
+    parser.add_argument("--port", type=int, default=int(os.getenv("FAULT_PROXY_PORT", "8080")))
+    arguments = parser.parse_args()
+    proxy = serve(
+        None if arguments.replay else arguments.upstream,
+        Scenario.load(arguments.scenario) if arguments.scenario else None,
+        arguments.record,
+        arguments.replay,
+        port=arguments.port,
+    )
+    print(f"Fault proxy ({proxy.scenario.name}) running at {proxy.url}")
+    threading.Event().wait()
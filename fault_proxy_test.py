@@ -0,0 +1,114 @@
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+import fault_proxy
+from fault_proxy import REDACTED, RouteProfile, Scenario
+
+
+class UpstreamHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        payload = json.dumps({"path": self.path, "token": "secret-token"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Set-Cookie", "session=secret-cookie; Path=/; HttpOnly")
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+@pytest.fixture
+def upstream():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), UpstreamHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def proxies():
+    started = []
+
+    def start(*args, **kwargs):
+        server = fault_proxy.serve(*args, **kwargs)
+        started.append(server)
+        return server
+
+    yield start
+    for server in started:
+        server.shutdown()
+        server.server_close()
+
+
+def test_passes_through_unmatched_routes(upstream, proxies):
+    scenario = Scenario([RouteProfile(match="^/slow", error_rate=1.0)], seed=1)
+    proxy = proxies(upstream, scenario)
+    response = requests.get(f"{proxy.url}/fast?x=1")
+    assert response.status_code == 200
+    assert response.json()["path"] == "/fast?x=1"
+    assert "Domain" not in response.headers["Set-Cookie"]
+
+
+def test_adds_latency(upstream, proxies):
+    latency = {"distribution": "fixed", "ms": 300}
+    proxy = proxies(upstream, Scenario([RouteProfile(latency=latency)]))
+    start = time.perf_counter()
+    requests.get(f"{proxy.url}/api")
+    assert time.perf_counter() - start >= 0.3
+    assert proxy.stats["delayed_seconds"] == pytest.approx(0.3)
+
+
+def test_injects_errors_and_drops(upstream, proxies):
+    proxy = proxies(
+        upstream,
+        Scenario(
+            [
+                RouteProfile(match="^/error", error_rate=1.0, error_status=502),
+                RouteProfile(match="^/drop", drop_rate=1.0),
+            ]
+        ),
+    )
+    assert requests.get(f"{proxy.url}/error").status_code == 502
+    with pytest.raises(requests.ConnectionError):
+        requests.get(f"{proxy.url}/drop")
+    assert proxy.stats["errors"] == 1
+    assert proxy.stats["dropped"] == 1
+
+
+def test_counts_concurrent_faults(upstream, proxies):
+    proxy = proxies(upstream, Scenario([RouteProfile(error_rate=1.0)]))
+    with ThreadPoolExecutor(16) as pool:
+        statuses = list(pool.map(lambda _: requests.get(f"{proxy.url}/").status_code, range(64)))
+    assert statuses == [503] * 64
+    assert proxy.stats["errors"] == 64
+
+
+def test_replays_a_redacted_recording(upstream, proxies, tmp_path):
+    path = str(tmp_path / "backend.ndjson")
+    recorder = proxies(upstream, record=path)
+    recorded = requests.get(f"{recorder.url}/api/accounts")
+    assert recorded.json()["token"] == "secret-token"
+    with open(path) as file:
+        contents = file.read()
+    assert "secret" not in contents
+    replayer = proxies(replay=path)
+    replayed = requests.get(f"{replayer.url}/api/accounts")
+    assert replayed.json() == {"path": "/api/accounts", "token": REDACTED}
+    assert replayed.headers["Set-Cookie"] == f"session={REDACTED}; Path=/; HttpOnly"
+    assert requests.get(f"{replayer.url}/api/other").status_code == 502
+    assert replayer.stats["not_recorded"] == 1
+
+
+def test_needs_an_upstream_or_a_recording():
+    with pytest.raises(ValueError):
+        fault_proxy.serve()
+    with pytest.raises(ValueError):
+        fault_proxy.serve("http://127.0.0.1:1", record="a.ndjson", replay="b.ndjson")
@@ -1,22 +1,36 @@
-from seleniumbase import BaseCase
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.common.by import By
 from dotenv import load_dotenv
 import os
 import logging
 import datetime
+import pytest
+from functools import partial
+from settle import SettleEngine
+from grid_observer import GridObserver
+from network_idle import NetworkIdle
+from timeouts import AdaptiveTimeouts
+from auth_state import LoginStateCache
+from http_login import HttpLogin
+from navigation import ChartOfAccountsNavigator
+from route_resolver import FundRouteResolver
+from browser_pool import BrowserPool
+from multi_tab import TabScheduler
+from grid_extract import extract_all_grid_rows
+from oracle import ResultOracle
+from coa_store import ChartOfAccountsStore
+import dataset
+import snapshot
+import stand_in_server
 from constants import (
     CLIENT_NAME,
-    ACCOUNT_NAME_TO_SEARCH,
-    NUMBER_TO_SEARCH,
-    COLUMN_ARK_TRANSACTION_FILTER,
-    ARK_TRANSACTION_FILTER_VALUE,
-    COLUMN_ATTRIBUTE_FILTER,
-    ATTRIBUTE_FILTER_VALUE,
-    COLUMN_FINANCIAL_STATEMENT_FILTER,
-    FINANCIAL_STATEMENT_FILTER_VALUE,
-    COLUMN_STATUS_FILTER,
-    STATUS_FILTER_VALUE,
+    FUND_NAME,
+    SEARCH_TERMS,
+    COLUMN_FILTERS,
+    NETWORK_IDLE_INCLUDE,
+    NETWORK_IDLE_EXCLUDE,
+    COLUMN_HEADERS,
+    ATTRIBUTE_LABELS,
+    ARK_TRANSACTION_LABELS,
 )
 
 # create log folder if not exists
@@ -26,7 +40,9 @@ log = logging.getLogger(__name__)
 shell_handler = logging.StreamHandler()
 
 log_file_path = "./logs/%s.log" % datetime.datetime.now().strftime("%m-%d-%Y_%H-%M-%S")
-file_handler = logging.FileHandler(log_file_path)
+# The file is only created once something is logged, so collecting the tests
+# leaves no empty log behind.
+file_handler = logging.FileHandler(log_file_path, delay=True)
 
 log.setLevel(logging.INFO)
 shell_handler.setLevel(logging.INFO)
@@ -46,201 +62,267 @@ file_handler.setFormatter(file_formatter)
 log.addHandler(shell_handler)
 log.addHandler(file_handler)
 
+load_dotenv()
+MULTI_TAB = os.getenv("MULTI_TAB") == "1"
 
-class TestWebPageLogin(BaseCase):
+
+class ChartOfAccountsPage:
     """
-    A test case class for testing web page login functionality.
+    Drives the login and the Chart of Accounts grid through a SeleniumBase
+    browser.
 
-    Inherits:
-        BaseCase: The base test case class.
+    Args:
+        sb (BaseCase): The SeleniumBase test case or SB() session.
 
     Methods:
-        __init__: Initializes the test case.
-        test_search_and_filters: Tests login, search and filters functionality.
+        log_in: Logs in without the form (cached state or HTTP).
+        login_via_form: Logs in through the login form.
         filter_items_by_account_or_number: Filters items by account or number.
         filter_items_by_selecting_columns: Filters items by selecting columns and passing a value.
         reset_filters: Resets the filters applied to a specific column in a grid.
+        report: Logs wait and render metrics and saves the timing history.
     """
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        print("Before logging setup")
-        load_dotenv()
-
-        if os.path.exists(log_file_path):
-            print(f"Log file created at: {os.path.abspath(log_file_path)}")
-        else:
-            print("Log file was not created")
-
+    def __init__(self, sb):
+        self.sb = sb
+        self.timeouts = AdaptiveTimeouts(logger=log)
+        self.settle = SettleEngine(sb, log, timeouts=self.timeouts)
+        self.grid_observer = GridObserver(sb, logger=log)
+        self.settle.register("grid_stable", lambda sb: self.grid_observer.is_stable())
+        self.network = NetworkIdle(
+            sb, NETWORK_IDLE_INCLUDE, NETWORK_IDLE_EXCLUDE, logger=log
+        )
+        self.settle.register("network_idle", lambda sb: self.network.is_idle())
+        self.auth_cache = LoginStateCache(
+            os.getenv("BASE_URL"), os.getenv("USERNAME_TEST"), logger=log
+        )
+        self.navigator = ChartOfAccountsNavigator(
+            sb,
+            os.getenv("BASE_URL"),
+            self.settle,
+            self.network,
+            self.timeouts,
+            FundRouteResolver(logger=log, base_url=os.getenv("BASE_URL")),
+            logger=log,
+        )
+        # True while a search or column filter may still be applied to the
+        # grid, i.e. from applying it until it was undone.
+        self.dirty = False
 
-    def test_search_and_filters(self):
-        # Open the web page
-        print("start test_login")
-        log.debug("starting test")
-        try:
-            log.info("Opening the web page and logging in")
-            self.open(os.getenv("BASE_URL"))
-            self.type('input[name="email"]', os.getenv("USERNAME_TEST"))
-            self.type('input[name="password"]', os.getenv("PASSWORD_TEST"))
-            self.click('button[type="submit"]')
-            self.wait(2)
-            log.info("Login success")
-        except Exception as e:
-            log.error(f"Error on Login: {e}")
+    def report(self):
+        self.settle.report()
+        self.grid_observer.report()
+        self.timeouts.save()
 
-        # Click on the "Clients" menu option
-        self.wait_for_element_visible("input#selector-client")
-        autocomplete_input_xpath = "//input[@id='selector-client']"
-        option_with_value_xpath = (
-            f"//ul[@role='listbox']//li[contains(text(), '{CLIENT_NAME}')]"
-        )
-        log.debug("Start: client Selection and sidebar option")
-        try:
-            self.type(autocomplete_input_xpath, CLIENT_NAME)
-            self.click(option_with_value_xpath)
-            self.click("#expand_collapse_sidebar")
-            self.click("#funds_menu_option")
-            self.wait(2)
-        except Exception as e:
-            log.error(f"Error selecting client and sidebar option: {e}")
+    def wait_visible(self, step, selector, default=10):
+        """
+        Waits for an element using the adaptive timeout of a named step.
 
-        # Click on the "De Buyer" fund
-        log.info("Click on 'De Buyer' fund")
-        try:
-            span_de_buyer = self.wait_for_element_visible("//span[text()='De Buyer']")
-            span_de_buyer.click()
-            self.assert_element_visible("button#general_ledger")
-            button = self.find_element("button#general_ledger")
-            button.click()
-            self.wait_for_element_visible("ul.MuiList-root")
-            log.info("Click on 'Chart of Accounts' menu option")
-            # Find the specific list item with text "Chart of Accounts (arkGL)"
-            self.wait(2)
-            self.wait_for_element_visible(
-                'a[role="menuitem"][href="/fund-nav/chart-of-accounts/aa9c0d49-c899-4116-9729-6d03cda179df"]'
-            )
-            chart_of_accounts_item = self.find_element(
-                'a[role="menuitem"][href="/fund-nav/chart-of-accounts/aa9c0d49-c899-4116-9729-6d03cda179df"]'
-            )
-            chart_of_accounts_item.click()
-            self.wait(2)
-        except Exception as e:
-            log.error(f"Error selecting on table de Buyer fund: {e}")
+        Args:
+            step (str): The step name the duration is recorded under.
+            selector (str): The element selector.
+            default (float): Timeout used until the step has enough history.
 
-        # <<<<<<<<<<<<<<<search using input search and filters>>>>>>>>>>>>>>>>>>>>>>>
-        log.info("Testing Search: Using input search by account name")
-        self.filter_items_by_account_or_number(ACCOUNT_NAME_TO_SEARCH)
+        Returns:
+            WebElement: The visible element.
+        """
+        return self.timeouts.wait_visible(self.sb, step, selector, default)
 
-        log.info("Testing Search:  using input search by number")
-        self.filter_items_by_account_or_number(NUMBER_TO_SEARCH)
+    def login_via_form(self):
+        """
+        Logs in by typing the .env credentials into the login form.
 
-        # <<<<<<<<<<<<<<<    filters using columns     >>>>>>>>>>>>>>>>>>>>>>>
-        # Filter on ARK Transaction column by General Expense
-        log.info("Filtering items by ARK Transaction column and General Expense value")
-        self.filter_items_by_selecting_columns(
-            COLUMN_ARK_TRANSACTION_FILTER, ARK_TRANSACTION_FILTER_VALUE
-        )
+        Returns:
+            None
+        """
+        self.sb.open(os.getenv("BASE_URL"))
+        self.sb.type('input[name="email"]', os.getenv("USERNAME_TEST"))
+        self.sb.type('input[name="password"]', os.getenv("PASSWORD_TEST"))
+        self.network.mark()
+        self.sb.click('button[type="submit"]')
+        self.network.wait_for_idle(label="login")
+        self.settle.until("login_redirect_done", legacy_sleep=2)
+
+    def is_logged_in(self):
+        """
+        Checks whether the app shows a logged-in page.
 
-        # reset filters
+        Returns:
+            bool: True if the client selector is visible.
+        """
+        return self.settle.until("login_redirect_done", legacy_sleep=0, timeout=5)
 
-        log.info("Resetting filters")
-        self.reset_filters(COLUMN_ARK_TRANSACTION_FILTER)
+    def log_in(self):
+        """
+        Logs in without the form: over HTTP when LOGIN_MODE=http, otherwise
+        from the cached browser state.
 
-        # Filter on Attribute column by Gain/Loss - Income Statement
-        log.info("Filtering items by Attribute Column and Gain/Loss - Income Statement")
-        self.filter_items_by_selecting_columns(
-            COLUMN_ATTRIBUTE_FILTER, ATTRIBUTE_FILTER_VALUE
-        )
-        log.info("Resetting filters")
-        self.reset_filters(COLUMN_ATTRIBUTE_FILTER)
+        Returns:
+            None
+        """
+        if os.getenv("LOGIN_MODE") == "http":
+            http_login = HttpLogin(
+                os.getenv("BASE_URL"),
+                auth_url=os.getenv("AUTH_URL"),
+                token_storage_key=os.getenv("AUTH_TOKEN_STORAGE_KEY", "token"),
+                logger=log,
+            )
+            http_login.login(
+                self.sb, os.getenv("USERNAME_TEST"), os.getenv("PASSWORD_TEST")
+            )
+            assert self.is_logged_in(), "The HTTP login did not reach a logged-in page"
+        else:
+            self.auth_cache.ensure_logged_in(
+                self.sb, self.login_via_form, self.is_logged_in
+            )
 
-        # Filter on Financial Statement column  by Cash and  Cash Equivalents
-        log.info(
-            "Filtering items by Financial Statement Column and Cash and Cash Equivalents"
-        )
-        self.filter_items_by_selecting_columns(
-            COLUMN_FINANCIAL_STATEMENT_FILTER, FINANCIAL_STATEMENT_FILTER_VALUE
-        )
+    def ensure_grid_ready(self):
+        """
+        Brings a shared browser back to the plain, unfiltered grid, e.g. after
+        a previous test failed with a popover open or could not undo its
+        search or filter. The grid keeps its search and filters in memory, so
+        reloading the page clears them.
 
-        self.reset_filters(COLUMN_FINANCIAL_STATEMENT_FILTER)
+        Returns:
+            None
+        """
+        if (
+            self.dirty
+            or self.sb.is_element_visible("div#popover_filter_text")
+            or self.sb.is_element_visible("input#search_accounts_popover")
+        ):
+            log.info("Reloading the grid left in a dirty state")
+            self.sb.refresh()
+            self.dirty = False
+            # A full reload costs far more than a check of the shown grid, so
+            # it keeps a timing history of its own.
+            self.wait_visible("grid_after_reload", "div[role='grid']")
+            return
+        self.wait_visible("grid", "div[role='grid']")
+
+    def undo_quietly(self, undo, *args):
+        """
+        Undoes a search or filter after a failure, without hiding the failure.
+        If the undo fails as well, the grid stays dirty and the next
+        ensure_grid_ready() reloads it.
 
-        # Filter on Status column by POSTED value
-        log.info("Filtering items by Status Column and POSTED value")
-        self.filter_items_by_selecting_columns(
-            COLUMN_STATUS_FILTER, STATUS_FILTER_VALUE
-        )
-        self.reset_filters(COLUMN_STATUS_FILTER)
+        Args:
+            undo (callable): The undo step, e.g. reset_filters.
+            *args: Its arguments.
 
-        log.info("test successfully completed")
+        Returns:
+            None
+        """
+        try:
+            undo(*args)
+        except Exception as e:
+            log.warning(f"Could not undo after a failure, the grid will be reloaded: {e}")
 
     def filter_items_by_account_or_number(self, filter_value):
         """
-        Filters items by account or number.
+        Filters items by account or number, then clears the search again,
+        also when reading the grid failed.
 
         Args:
             filter_value (str): The value to filter by.
 
+        Raises:
+            Exception: If an error occurs while searching.
+
         Returns:
-            None
+            list: The grid rows shown for the search, keyed by column header.
         """
         try:
             log.info(f"Starting Filtering items by account or number: {filter_value}")
-            self.wait_for_element_visible("input#search_accounts")
-            self.assert_element_visible("input#search_accounts")
-            self.click("input#search_accounts")
-            self.wait(2)
+            self.wait_visible("search_input", "input#search_accounts")
+            self.sb.assert_element_visible("input#search_accounts")
+            self.sb.click("input#search_accounts")
+            self.settle.until("popover_open", legacy_sleep=2)
             #TODO: check this line, sometimes it fails
             # self.wait_for_element_visible("input#search_accounts_popover")
-            self.click("input#search_accounts_popover")
-            self.wait_for_element_visible("input#search_accounts_popover")
-            self.type("input#search_accounts_popover", filter_value)
-            self.send_keys("input#search_accounts_popover", "\n")
-            self.wait_for_element_visible("div[role='grid']")
+            self.sb.click("input#search_accounts_popover")
+            self.wait_visible("search_popover", "input#search_accounts_popover")
+            self.sb.type("input#search_accounts_popover", filter_value)
+            self.grid_observer.arm(f"search {filter_value}")
+            self.dirty = True
+            self.sb.send_keys("input#search_accounts_popover", "\n")
+        except Exception as e:
+            log.error(f"Error on filter_items_by_account_or_number: {e}")
+            raise
+        try:
+            self.wait_visible("grid", "div[role='grid']")
+            self.grid_observer.wait_until_stable()
             grid_with_value_xpath = f"//div[@role='grid']"
-            grid_table = self.find_element(grid_with_value_xpath)
-            self.assert_element_visible(grid_with_value_xpath)
-
-            # Clear search items
-            self.click("input#search_accounts")
-            self.click("input#search_accounts_popover")
-            self.wait(1)
-            for i in range(len(filter_value)):
-                self.send_keys("input#search_accounts_popover", Keys.BACKSPACE)
-            self.wait(2)
-            log.info(f"Items filtered by account or number success: {filter_value}")
+            grid_table = self.sb.find_element(grid_with_value_xpath)
+            self.sb.assert_element_visible(grid_with_value_xpath)
+            rows = extract_all_grid_rows(self.sb)
+            log.info(f"Search {filter_value} shows {len(rows)} rows")
         except Exception as e:
             log.error(f"Error on filter_items_by_account_or_number: {e}")
+            self.undo_quietly(self.clear_search, filter_value)
+            raise
+        self.clear_search(filter_value)
+        log.info(f"Items filtered by account or number success: {filter_value}")
+        return rows
+
+    def clear_search(self, filter_value):
+        """
+        Clears the search typed by filter_items_by_account_or_number().
+
+        Args:
+            filter_value (str): The search text to erase.
+
+        Returns:
+            None
+        """
+        self.sb.click("input#search_accounts")
+        self.sb.click("input#search_accounts_popover")
+        self.settle.until("popover_open", legacy_sleep=1)
+        self.grid_observer.arm(f"clear search {filter_value}")
+        for i in range(len(filter_value)):
+            self.sb.send_keys("input#search_accounts_popover", Keys.BACKSPACE)
+        self.settle.until("grid_stable", legacy_sleep=2)
+        self.dirty = False
 
     def filter_items_by_selecting_columns(self, column, filter_value):
         """
-        Filters items by selecting columns.
+        Filters items by selecting columns. If reading the filtered grid
+        fails, the filter is reset before the error is raised.
 
         Args:
             column (str): The column identifier.
             filter_value (str): The value to filter by.
 
+        Raises:
+            Exception: If an error occurs while filtering.
+
         Returns:
-            None
+            list: The grid rows shown for the filter, keyed by column header.
         """
         log.info(f"Starting Filtering items by selecting columns: {column} and {filter_value}")
-        self.wait_for_element_visible("div[role='grid']", timeout=10)
+        self.wait_visible("grid", "div[role='grid']", default=10)
         grid_with_value_xpath = f"//div[@role='grid']"
-        grid_table = self.find_element(grid_with_value_xpath)
+        grid_table = self.sb.find_element(grid_with_value_xpath)
         try:
-            self.wait_for_element_visible(f"div#{column}", timeout=3)
-            self.click(f"div#{column}")
-            self.wait_for_element_visible("div#popover_filter_text")
-            self.uncheck_if_checked("label#check_all span input")
-            self.check_if_unchecked('input[name="' + filter_value + '"]')
-            self.click("#btn_apply")
+            self.wait_visible("column_header", f"div#{column}", default=3)
+            self.sb.click(f"div#{column}")
+            self.wait_visible("filter_popover", "div#popover_filter_text")
+            self.sb.uncheck_if_checked("label#check_all span input")
+            self.sb.check_if_unchecked('input[name="' + filter_value + '"]')
+            self.grid_observer.arm(f"filter {column}={filter_value}")
+            self.network.mark()
+            self.dirty = True
+            self.sb.click("#btn_apply")
+            self.network.wait_for_idle(label=f"filter {column}")
+            self.grid_observer.wait_until_stable()
+            rows = extract_all_grid_rows(self.sb)
         except Exception as e:
-            grid = self.find_element("div[role='grid']")
-            grid.click()
-            cell = grid.find_element(By.XPATH, ".//div[@role='cell']")
-            cell.click()
-            self.driver.execute_script("arguments[0].scrollLeft += 1000;", grid)
-            self.wait(10)
-        log.info(f"Items filtered by selecting columns success: {column}")
+            log.error(f"Error on filter_items_by_selecting_columns: {e}")
+            if self.dirty:
+                self.undo_quietly(self.reset_filters, column)
+            raise
+        log.info(f"Items filtered by selecting columns success: {column} ({len(rows)} rows)")
+        return rows
 
     def reset_filters(self, column):
         """
@@ -256,27 +338,204 @@ class TestWebPageLogin(BaseCase):
             None
         """
         log.info(f"Starting Resetting filters for column: {column}")
-        self.wait_for_element_visible("div[role='grid']")
+        self.wait_visible("grid", "div[role='grid']")
         grid_with_value_xpath = f"//div[@role='grid']"
-        grid_table = self.find_element(grid_with_value_xpath)
+        grid_table = self.sb.find_element(grid_with_value_xpath)
 
         try:
-            self.wait_for_element_visible(f"div#{column}", timeout=3)
-            self.click(f"div#{column}")
-            self.wait_for_element_visible("div#popover_filter_text")
-            self.wait_for_element_visible("button#btn_clear")
-            self.click("#btn_clear")
-            self.click("#btn_apply")
-            self.wait(2)
+            self.wait_visible("column_header", f"div#{column}", default=3)
+            self.sb.click(f"div#{column}")
+            self.wait_visible("filter_popover", "div#popover_filter_text")
+            self.wait_visible("clear_button", "button#btn_clear")
+            self.sb.click("#btn_clear")
+            self.grid_observer.arm(f"reset {column}")
+            self.network.mark()
+            self.sb.click("#btn_apply")
+            self.network.wait_for_idle(label=f"reset {column}")
+            self.settle.until("grid_stable", legacy_sleep=2)
         except Exception as e:
-            grid = self.find_element("div[role='grid']")
-            grid.click()
-            cell = grid.find_element(By.XPATH, ".//div[@role='cell']")
-            cell.click()
-            self.driver.execute_script("arguments[0].scrollLeft += 1000;", grid)
-            self.wait(10)
+            log.error(f"Error on reset_filters: {e}")
+            raise
+        self.dirty = False
         log.info(f"Filters reset for column success: {column}")
 
+    def column_filter_steps(self, column, filter_value, shown):
+        """
+        Filters and resets one column as a TabScheduler case, yielding instead
+        of blocking whenever the tab has to wait.
 
-if __name__ == "__main__":
-    main()
+        Args:
+            column (str): The column identifier.
+            filter_value (str): The value to filter by.
+            shown (dict): Receives the filtered grid rows under the column.
+
+        Yields:
+            callable: The condition the tab is waiting for.
+        """
+        sb = self.sb
+        observer = GridObserver(sb, logger=log)
+        yield lambda: sb.is_element_visible(f"div#{column}")
+        sb.click(f"div#{column}")
+        yield lambda: sb.is_element_visible("div#popover_filter_text")
+        sb.uncheck_if_checked("label#check_all span input")
+        sb.check_if_unchecked('input[name="' + filter_value + '"]')
+        observer.arm(f"tab filter {column}={filter_value}")
+        sb.click("#btn_apply")
+        yield observer.is_stable
+        shown[column] = extract_all_grid_rows(sb)
+        sb.click(f"div#{column}")
+        yield lambda: sb.is_element_visible("button#btn_clear")
+        sb.click("#btn_clear")
+        observer.arm(f"tab reset {column}")
+        sb.click("#btn_apply")
+        yield observer.is_stable
+
+
+@pytest.fixture(scope="session")
+def browser_pool():
+    """
+    Browsers launched ahead of time for this xdist worker.
+    """
+    print(f"Log file created at: {os.path.abspath(log_file_path)}")
+    pool = BrowserPool(int(os.getenv("BROWSER_POOL_SIZE", "2")), logger=log)
+    pool.start()
+    yield pool
+    pool.report()
+    pool.close()
+
+
+@pytest.fixture
+def pooled_sb(browser_pool):
+    sb = browser_pool.acquire()
+    yield sb
+    browser_pool.release(sb)
+
+
+@pytest.fixture(scope="session")
+def chart_of_accounts_session(browser_pool):
+    """
+    One logged-in browser per xdist worker, already on the Chart of Accounts.
+    """
+    sb = browser_pool.acquire()
+    page = ChartOfAccountsPage(sb)
+    log.info("Opening the web page and logging in")
+    page.log_in()
+    log.info(f"Opening the Chart of Accounts of {FUND_NAME}")
+    page.navigator.open(CLIENT_NAME, FUND_NAME)
+    yield page
+    page.report()
+    browser_pool.release(sb)
+
+
+@pytest.fixture(scope="session")
+def oracle():
+    path = os.getenv("CHART_PATH")
+    if path and path.endswith(snapshot.SUFFIX):
+        store = snapshot.SnapshotStore(path)
+    else:
+        store = ChartOfAccountsStore.from_items(dataset.stream(path))
+    labels, ark_labels = ATTRIBUTE_LABELS, ARK_TRANSACTION_LABELS
+    if os.getenv("STAND_IN") == "1":
+        labels = stand_in_server.ATTRIBUTE_LABELS
+        ark_labels = stand_in_server.ARK_TRANSACTION_LABELS
+    # The stand-in names the first fund of the chart FUND_NAME.
+    fund_id = os.getenv("FUND_ID") or store.value("fundId", 0)
+    return ResultOracle(
+        store, labels, logger=log, fund_id=fund_id, ark_transaction_labels=ark_labels
+    )
+
+
+def assert_rows_match(oracle, expected, rows):
+    """
+    Fails if the grid rows differ from the accounts the oracle expects.
+
+    Args:
+        oracle (ResultOracle): The oracle that computed the expectation.
+        expected (set): The expected account numbers.
+        rows (list): Every grid row, from extract_all_grid_rows().
+
+    Returns:
+        None
+    """
+    missing, unexpected = oracle.diff(expected, rows)
+    assert not unexpected, f"Grid shows unexpected accounts: {sorted(unexpected)}"
+    assert not missing, f"Grid is missing accounts: {sorted(missing)}"
+
+
+def assert_filter_applied(oracle, column, filter_value, rows):
+    """
+    Fails if the grid rows are not what a column filter should show.
+
+    Columns the data has a counterpart for are checked against the oracle's
+    exact expectation; the others are checked against the grid itself.
+
+    Args:
+        oracle (ResultOracle): The oracle.
+        column (str): The column identifier.
+        filter_value (str): The value checked in the filter popover.
+        rows (list): Every grid row, from extract_all_grid_rows().
+
+    Returns:
+        None
+    """
+    expected = oracle.expected_for_filter(column, filter_value)
+    if expected is not None:
+        assert_rows_match(oracle, expected, rows)
+        return
+    assert rows, f"Filtering {column} by {filter_value} shows no rows"
+    unfiltered = oracle.unfiltered(rows, COLUMN_HEADERS[column], filter_value)
+    assert not unfiltered, (
+        f"Filtering {column} by {filter_value} still shows {sorted(unfiltered)}"
+    )
+
+
+@pytest.fixture
+def chart_of_accounts(chart_of_accounts_session):
+    chart_of_accounts_session.ensure_grid_ready()
+    return chart_of_accounts_session
+
+
+def test_login_form(pooled_sb):
+    log.info("Smoke testing the login form")
+    page = ChartOfAccountsPage(pooled_sb)
+    page.login_via_form()
+    pooled_sb.assert_element_visible("input#selector-client")
+    page.report()
+    log.info("Login form smoke test success")
+
+
+@pytest.mark.parametrize("search_term", SEARCH_TERMS)
+def test_search(chart_of_accounts, oracle, search_term):
+    log.info(f"Testing Search: using input search by {search_term}")
+    rows = chart_of_accounts.filter_items_by_account_or_number(search_term)
+    assert_rows_match(oracle, oracle.expected_for_search(search_term), rows)
+
+
+@pytest.mark.skipif(MULTI_TAB, reason="column filters run in tabs (MULTI_TAB=1)")
+@pytest.mark.parametrize(
+    "column, filter_value", COLUMN_FILTERS, ids=[c for c, _ in COLUMN_FILTERS]
+)
+def test_column_filter(chart_of_accounts, oracle, column, filter_value):
+    log.info(f"Filtering items by {column} and {filter_value} value")
+    rows = chart_of_accounts.filter_items_by_selecting_columns(column, filter_value)
+    log.info("Resetting filters")
+    chart_of_accounts.reset_filters(column)
+    assert_filter_applied(oracle, column, filter_value, rows)
+
+
+@pytest.mark.skipif(not MULTI_TAB, reason="set MULTI_TAB=1 to run filters in tabs")
+def test_column_filters_in_tabs(chart_of_accounts, oracle):
+    log.info("Filtering items by every column in parallel tabs")
+    scheduler = TabScheduler(chart_of_accounts.sb, logger=log)
+    shown = {}
+    results = scheduler.run(
+        chart_of_accounts.sb.get_current_url(),
+        {
+            column: partial(chart_of_accounts.column_filter_steps, column, value, shown)
+            for column, value in COLUMN_FILTERS
+        },
+    )
+    failures = {column: error for column, error in results.items() if error}
+    assert not failures, failures
+    for column, value in COLUMN_FILTERS:
+        assert_filter_applied(oracle, column, value, shown[column])
@@ -0,0 +1,148 @@
+# Reads every rendered row of the grid in one round trip. Cells are matched to
+# their header by aria-colindex, falling back to data-field (MUI DataGrid).
+EXTRACT_ROWS_SCRIPT = """
+var grid = document.querySelector(arguments[0]);
+if (!grid) { return null; }
+var byIndex = {}, byField = {};
+grid.querySelectorAll("[role='columnheader']").forEach(function (header) {
+    var title = header.querySelector(".MuiDataGrid-columnHeaderTitle") || header;
+    var field = header.getAttribute("data-field");
+    var name = title.innerText.trim() || field;
+    var index = header.getAttribute("aria-colindex");
+    if (index) { byIndex[index] = name; }
+    if (field) { byField[field] = name; }
+});
+var rows = [];
+grid.querySelectorAll("[role='row']").forEach(function (row) {
+    var cells = row.querySelectorAll("[role='cell'], [role='gridcell']");
+    if (!cells.length) { return; }
+    var values = {};
+    cells.forEach(function (cell, position) {
+        var index = cell.getAttribute("aria-colindex");
+        var field = cell.getAttribute("data-field");
+        var name = byIndex[index] || byField[field] || field || "column " + (position + 1);
+        values[name] = cell.innerText.trim();
+    });
+    rows.push(values);
+});
+return rows;
+"""
+
+# Scrolls the grid's scroll container one viewport down (or back to the top)
+# and reports, once rows stopped changing and no progress bar shows, whether
+# the end of the grid has been reached. MUI DataGrid scrolls inside
+# .MuiDataGrid-virtualScroller; other grids scroll their nearest scrollable
+# ancestor, where reaching the end may load the next page.
+SCROLL_SCRIPT = """
+var grid = document.querySelector(arguments[0]);
+var toTop = arguments[1], quietMs = arguments[2];
+var done = arguments[arguments.length - 1];
+if (!grid) { done(null); return; }
+function scroller() {
+    var inner = grid.querySelector(".MuiDataGrid-virtualScroller");
+    if (inner) { return inner; }
+    for (var node = grid; node; node = node.parentElement) {
+        var overflow = getComputedStyle(node).overflowY;
+        if ((overflow === "auto" || overflow === "scroll") && node.scrollHeight > node.clientHeight) {
+            return node;
+        }
+    }
+    return document.scrollingElement;
+}
+var box = scroller();
+if (toTop) { box.scrollTop = 0; done(true); return; }
+var last = performance.now();
+var observer = new MutationObserver(function () { last = performance.now(); });
+observer.observe(grid, {childList: true, subtree: true, attributes: true, attributeFilter: ["class"]});
+box.scrollTop += box.clientHeight;
+function loading() {
+    var bar = grid.querySelector("[role='progressbar']");
+    return bar !== null && bar.offsetParent !== null;
+}
+function check() {
+    if (loading() || performance.now() - last < quietMs) { setTimeout(check, 50); return; }
+    observer.disconnect();
+    done(box.scrollTop + box.clientHeight >= box.scrollHeight - 1);
+}
+check();
+"""
+
+
+def extract_grid_rows(sb, selector="div[role='grid']"):
+    """
+    Returns every rendered row of the grid as a dict keyed by column header.
+
+    The whole grid is read by one script inside the page instead of one
+    WebDriver call per cell. Rows outside the virtualised viewport are not
+    rendered and therefore not returned; see extract_all_grid_rows().
+
+    Args:
+        sb (BaseCase): The SeleniumBase test case driving the browser.
+        selector (str): CSS selector of the grid.
+
+    Raises:
+        LookupError: If the grid is not in the page.
+
+    Returns:
+        list: One dict of header text to cell text per row.
+    """
+    rows = sb.execute_script(EXTRACT_ROWS_SCRIPT, selector)
+    if rows is None:
+        raise LookupError(f"No grid matches {selector}")
+    return rows
+
+
+def extract_all_grid_rows(
+    sb, selector="div[role='grid']", quiet_ms=300, timeout=30, max_steps=10000
+):
+    """
+    Returns every row of the grid, scrolling through it so that rows outside
+    the virtualised viewport (or on pages loaded on scroll) are read too.
+
+    The grid is scrolled a viewport at a time until its end is reached and no
+    new row appears, then scrolled back to the top.
+
+    Args:
+        sb (BaseCase): The SeleniumBase test case driving the browser.
+        selector (str): CSS selector of the grid.
+        quiet_ms (int): How long the rows must stop changing after a scroll.
+        timeout (float): Seconds one scroll step may take.
+        max_steps (int): Scroll steps before giving up.
+
+    Raises:
+        LookupError: If the grid is not in the page.
+        RuntimeError: If the end of the grid is not reached in max_steps.
+
+    Returns:
+        list: One dict of header text to cell text per row, in grid order.
+    """
+    rows = []
+    seen = set()
+
+    def collect():
+        added = 0
+        for row in extract_grid_rows(sb, selector):
+            key = tuple(sorted(row.items()))
+            if key not in seen:
+                seen.add(key)
+                rows.append(row)
+                added += 1
+        return added
+
+    driver = sb.driver
+    previous_timeout = driver.timeouts.script
+    driver.set_script_timeout(timeout)
+    try:
+        collect()
+        for _ in range(max_steps):
+            at_end = driver.execute_async_script(SCROLL_SCRIPT, selector, False, quiet_ms)
+            if at_end is None:
+                raise LookupError(f"No grid matches {selector}")
+            if not collect() and at_end:
+                break
+        else:
+            raise RuntimeError(f"Grid end not reached after {max_steps} scroll steps")
+        driver.execute_async_script(SCROLL_SCRIPT, selector, True, quiet_ms)
+    finally:
+        driver.set_script_timeout(previous_timeout)
+    return rows
@@ -0,0 +1,158 @@
+import logging
+
+# Watches the grid with a MutationObserver and keeps the timestamps in
+# window.__gridWatch so later calls can decide whether it has settled.
+ARM_SCRIPT = """
+var grid = document.querySelector(arguments[0]);
+if (!grid) { return false; }
+var previous = window.__gridWatch;
+if (previous && previous.observer) { previous.observer.disconnect(); }
+var target = grid.querySelector("[role='rowgroup']") || grid;
+var watch = {armedAt: performance.now(), lastMutation: null, mutations: 0};
+watch.observer = new MutationObserver(function (records) {
+    watch.mutations += records.length;
+    watch.lastMutation = performance.now();
+});
+watch.observer.observe(target, {
+    childList: true, subtree: true, characterData: true
+});
+window.__gridWatch = watch;
+return true;
+"""
+
+STATE_SCRIPT = """
+var watch = window.__gridWatch;
+if (!watch) { return null; }
+var now = performance.now();
+var last = watch.lastMutation === null ? watch.armedAt : watch.lastMutation;
+return {
+    mutations: watch.mutations,
+    quietMs: now - last,
+    renderMs: watch.lastMutation === null ? null : watch.lastMutation - watch.armedAt
+};
+"""
+
+WAIT_SCRIPT = """
+var quietMs = arguments[0], timeoutMs = arguments[1], requireMutation = arguments[2];
+var done = arguments[arguments.length - 1];
+var watch = window.__gridWatch;
+if (!watch) { done(null); return; }
+function check() {
+    var now = performance.now();
+    var last = watch.lastMutation === null ? watch.armedAt : watch.lastMutation;
+    var seen = watch.mutations > 0 || !requireMutation;
+    var settled = seen && now - last >= quietMs;
+    if (settled || now - watch.armedAt >= timeoutMs) {
+        watch.observer.disconnect();
+        done({
+            settled: settled,
+            mutations: watch.mutations,
+            renderMs: watch.lastMutation === null ? null : watch.lastMutation - watch.armedAt
+        });
+        return;
+    }
+    setTimeout(check, 50);
+}
+check();
+"""
+
+
+class GridObserver:
+    """
+    Detects when the rows of div[role='grid'] have stopped changing.
+
+    Call arm() right before the action that refreshes the grid (a search,
+    #btn_apply, ...) and then wait_until_stable(), or poll is_stable() through
+    the settle engine. The time between arming and the last row mutation is
+    kept as the render latency of that action.
+
+    Args:
+        sb (BaseCase): The SeleniumBase test case driving the browser.
+        selector (str): CSS selector of the grid.
+        quiet_ms (int): How long the grid must go without mutations to count
+            as stable.
+        logger (logging.Logger): Where latencies are logged.
+    """
+
+    def __init__(self, sb, selector="div[role='grid']", quiet_ms=300, logger=None):
+        self.sb = sb
+        self.selector = selector
+        self.quiet_ms = quiet_ms
+        self.log = logger or logging.getLogger(__name__)
+        self.latencies = []
+        self.label = None
+
+    def arm(self, label=None):
+        """
+        Starts watching the grid for row mutations.
+
+        Args:
+            label (str): Name recorded with the render latency.
+
+        Returns:
+            bool: False if the grid is not in the page yet.
+        """
+        self.label = label
+        return bool(self.sb.execute_script(ARM_SCRIPT, self.selector))
+
+    def is_stable(self, require_mutation=True):
+        """
+        Checks, without blocking, whether the grid has been quiet long enough.
+
+        Args:
+            require_mutation (bool): Only count as stable once the rows changed
+                at least once since arm().
+
+        Returns:
+            bool: True once the grid is stable.
+        """
+        state = self.sb.execute_script(STATE_SCRIPT)
+        if state is None:
+            return False
+        if require_mutation and not state["mutations"]:
+            return False
+        if state["quietMs"] < self.quiet_ms:
+            return False
+        self._record(state["renderMs"])
+        return True
+
+    def wait_until_stable(self, timeout=10, require_mutation=True):
+        """
+        Blocks inside the page until the grid is stable.
+
+        Args:
+            timeout (float): Seconds to wait before giving up.
+            require_mutation (bool): Wait for at least one row mutation first.
+
+        Returns:
+            float: The render latency in milliseconds, or None on timeout.
+        """
+        driver = self.sb.driver
+        previous_timeout = driver.timeouts.script
+        driver.set_script_timeout(timeout + 5)
+        try:
+            result = driver.execute_async_script(
+                WAIT_SCRIPT, self.quiet_ms, timeout * 1000, require_mutation
+            )
+        finally:
+            driver.set_script_timeout(previous_timeout)
+        if not result or not result["settled"]:
+            self.log.warning(f"Grid did not stabilise within {timeout}s ({self.label})")
+            return None
+        return self._record(result["renderMs"])
+
+    def _record(self, render_ms):
+        render_ms = render_ms or 0.0
+        self.latencies.append((self.label, render_ms))
+        self.log.info(f"Grid stabilised in {render_ms:.0f}ms ({self.label})")
+        return render_ms
+
+    def report(self):
+        """
+        Logs the render latency of every armed action.
+
+        Returns:
+            None
+        """
+        for label, render_ms in self.latencies:
+            self.log.info(f"Grid render latency: {label}: {render_ms:.0f}ms")
@@ -0,0 +1,169 @@
+import logging
+from array import array
+
+NO_PARENT = -1
+
+
+class AccountHierarchy:
+    """
+    The parentId tree of a chart of accounts, flattened once into Euler-tour
+    intervals.
+
+    Accounts are numbered in preorder; an account's subtree is the contiguous
+    range [enter, leave] of that order. Descendant checks are O(1), subtrees
+    are a slice of the preorder and paths to the root are output-linear, so no
+    recursive walk is needed per row.
+
+    Accounts whose parentId does not exist (orphans) are reported and treated
+    as roots. Each parentId cycle is reported and broken at one account,
+    which becomes a root; the rest of the cycle and the accounts hanging off
+    it keep their real parents.
+
+    Args:
+        store (ChartOfAccountsStore): The accounts.
+        logger (logging.Logger): Where orphans and cycles are reported.
+    """
+
+    def __init__(self, store, logger=None):
+        self.store = store
+        self.log = logger or logging.getLogger(__name__)
+        size = len(store)
+        self.parent = array("i", [NO_PARENT]) * size
+        self.orphans = []
+        self.cycles = []
+        parent_ids = store.strings["parentId"]
+        children = [[] for _ in range(size)]
+        roots = []
+        for row in range(size):
+            parent_id = parent_ids[row]
+            if parent_id is None:
+                roots.append(row)
+                continue
+            parent = store.row_of_id(parent_id)
+            if parent is None:
+                self.orphans.append((row, parent_id))
+                roots.append(row)
+                continue
+            self.parent[row] = parent
+            children[parent].append(row)
+        self.order = array("i")
+        self.enter = array("i", [0]) * size
+        self.leave = array("i", [0]) * size
+        self.depth = array("i", [0]) * size
+        visited = bytearray(size)
+        for root in roots:
+            self._walk(root, children, visited)
+        # Whatever the roots did not reach hangs off a cycle: following the
+        # parents from it ends up going round that cycle.
+        for row in range(size):
+            if visited[row]:
+                continue
+            seen = set()
+            start = row
+            while start not in seen:
+                seen.add(start)
+                start = self.parent[start]
+            cycle = [start]
+            member = self.parent[start]
+            while member != start:
+                cycle.append(member)
+                member = self.parent[member]
+            self.cycles.append(cycle)
+            self.parent[start] = NO_PARENT
+            self._walk(start, children, visited)
+        if self.orphans:
+            self.log.warning(f"{len(self.orphans)} accounts have a missing parent")
+        if self.cycles:
+            self.log.warning(f"{len(self.cycles)} parentId cycles were broken")
+
+    @classmethod
+    def from_arrays(cls, store, parent, order, enter, leave, depth, orphans=(), cycles=()):
+        """
+        Wraps a hierarchy computed earlier, e.g. one mapped from a snapshot,
+        without walking the tree again.
+
+        Args:
+            store (ChartOfAccountsStore): The accounts.
+            parent (Sequence): Parent row per row.
+            order (Sequence): Rows in preorder.
+            enter (Sequence): Preorder position per row.
+            leave (Sequence): Last preorder position of each subtree.
+            depth (Sequence): Depth per row.
+            orphans (list): The (row, missing parentId) pairs.
+            cycles (list): The rows of each broken cycle.
+
+        Returns:
+            AccountHierarchy: The hierarchy.
+        """
+        hierarchy = cls.__new__(cls)
+        hierarchy.store = store
+        hierarchy.log = logging.getLogger(__name__)
+        hierarchy.parent = parent
+        hierarchy.order = order
+        hierarchy.enter = enter
+        hierarchy.leave = leave
+        hierarchy.depth = depth
+        hierarchy.orphans = [tuple(orphan) for orphan in orphans]
+        hierarchy.cycles = [list(cycle) for cycle in cycles]
+        return hierarchy
+
+    def _walk(self, root, children, visited):
+        visited[root] = 1
+        self.depth[root] = 0
+        self.enter[root] = len(self.order)
+        self.order.append(root)
+        stack = [(root, iter(children[root]))]
+        while stack:
+            row, pending = stack[-1]
+            child = next(pending, None)
+            if child is None:
+                self.leave[row] = len(self.order) - 1
+                stack.pop()
+            elif not visited[child]:
+                visited[child] = 1
+                self.depth[child] = self.depth[row] + 1
+                self.enter[child] = len(self.order)
+                self.order.append(child)
+                stack.append((child, iter(children[child])))
+
+    def is_descendant(self, row, ancestor):
+        """
+        Checks whether an account sits below another one.
+
+        Args:
+            row (int): The candidate descendant.
+            ancestor (int): The candidate ancestor.
+
+        Returns:
+            bool: True if row is a strict descendant of ancestor.
+        """
+        return self.enter[ancestor] < self.enter[row] <= self.leave[ancestor]
+
+    def subtree(self, row):
+        """
+        Returns an account and all its descendants, in preorder.
+
+        Args:
+            row (int): The subtree root.
+
+        Returns:
+            array: The rows of the subtree.
+        """
+        return self.order[self.enter[row] : self.leave[row] + 1]
+
+    def path_to_root(self, row):
+        """
+        Returns the ancestors of an account, nearest first.
+
+        Args:
+            row (int): The account.
+
+        Returns:
+            list: The ancestor rows, ending with the root.
+        """
+        path = []
+        row = self.parent[row]
+        while row != NO_PARENT:
+            path.append(row)
+            row = self.parent[row]
+        return path
@@ -0,0 +1,69 @@
+import dataset
+from coa_store import ChartOfAccountsStore
+from hierarchy import AccountHierarchy, NO_PARENT
+
+
+def account(account_id, parent_id, number):
+    return {"id": account_id, "parentId": parent_id, "number": number}
+
+
+def build(*accounts):
+    store = ChartOfAccountsStore.from_items(accounts)
+    return store, AccountHierarchy(store)
+
+
+def test_intervals_match_parent_links_on_mock_data():
+    store = ChartOfAccountsStore.from_items(dataset.stream())
+    hierarchy = AccountHierarchy(store)
+    assert not hierarchy.orphans and not hierarchy.cycles
+    assert sorted(hierarchy.order) == list(range(len(store)))
+    for row in range(len(store)):
+        ancestors = hierarchy.path_to_root(row)
+        for ancestor in range(len(store)):
+            assert hierarchy.is_descendant(row, ancestor) == (ancestor in ancestors)
+        assert hierarchy.depth[row] == len(ancestors)
+
+
+def test_subtree_is_a_preorder_slice():
+    _, hierarchy = build(
+        account("root", None, 1),
+        account("left", "root", 2),
+        account("leaf", "left", 3),
+        account("right", "root", 4),
+    )
+    assert list(hierarchy.subtree(0)) == [0, 1, 2, 3]
+    assert list(hierarchy.subtree(1)) == [1, 2]
+    assert list(hierarchy.subtree(3)) == [3]
+
+
+def test_orphans_become_roots():
+    _, hierarchy = build(
+        account("root", None, 1),
+        account("orphan", "gone", 2),
+        account("child", "orphan", 3),
+    )
+    assert hierarchy.orphans == [(1, "gone")]
+    assert hierarchy.parent[1] == NO_PARENT
+    assert hierarchy.path_to_root(2) == [1]
+    assert not hierarchy.cycles
+
+
+def test_cycle_descendants_keep_their_parents():
+    # c hangs off the a <-> b cycle without being on it.
+    _, hierarchy = build(
+        account("c", "b", 3),
+        account("a", "b", 1),
+        account("b", "a", 2),
+    )
+    assert len(hierarchy.cycles) == 1
+    assert sorted(hierarchy.cycles[0]) == [1, 2]
+    assert hierarchy.parent[hierarchy.cycles[0][0]] == NO_PARENT
+    assert hierarchy.path_to_root(0)[0] == 2
+    assert hierarchy.is_descendant(0, 2)
+    assert sorted(hierarchy.order) == [0, 1, 2]
+
+
+def test_self_parent_is_a_cycle():
+    _, hierarchy = build(account("a", "a", 1), account("b", "a", 2))
+    assert hierarchy.cycles == [[0]]
+    assert hierarchy.path_to_root(1) == [0]
@@ -0,0 +1,131 @@
+import logging
+import requests
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_session = None
+
+
+def pooled_session():
+    """
+    Returns the requests session shared by every login in this process.
+
+    Returns:
+        requests.Session: A session with a keep-alive connection pool.
+    """
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        retries = Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries)
+        _session.mount("http://", adapter)
+        _session.mount("https://", adapter)
+    return _session
+
+
+class HttpLogin:
+    """
+    Logs in against the backend over HTTP and pushes the resulting token and
+    cookies into the browser, skipping the login form.
+
+    Args:
+        base_url (str): The application URL (BASE_URL).
+        auth_url (str): The login endpoint. Defaults to BASE_URL/api/auth/login.
+        token_storage_key (str): localStorage key the app reads the token from.
+        timeout (float): HTTP timeout in seconds.
+        logger (logging.Logger): Where progress is logged.
+    """
+
+    def __init__(
+        self,
+        base_url,
+        auth_url=None,
+        token_storage_key="token",
+        timeout=10,
+        logger=None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.auth_url = auth_url or f"{self.base_url}/api/auth/login"
+        self.token_storage_key = token_storage_key
+        self.timeout = timeout
+        self.log = logger or logging.getLogger(__name__)
+        self.session = pooled_session()
+
+    @property
+    def origin(self):
+        parts = urlsplit(self.base_url)
+        return f"{parts.scheme}://{parts.netloc}/"
+
+    def authenticate(self, username, password):
+        """
+        Posts the credentials to the login endpoint.
+
+        Args:
+            username (str): The user email.
+            password (str): The user password.
+
+        Raises:
+            requests.HTTPError: If the backend rejects the credentials.
+            ValueError: If the response carries neither a token nor cookies.
+
+        Returns:
+            dict: The token (or None) and the cookies set by the backend.
+        """
+        response = self.session.post(
+            self.auth_url,
+            json={"email": username, "password": password},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        token = (
+            body.get("token") or body.get("accessToken") or body.get("access_token")
+        )
+        cookies = [
+            {"name": c.name, "value": c.value, "path": c.path or "/", "secure": c.secure}
+            for c in response.cookies
+        ]
+        if not token and not cookies:
+            raise ValueError(f"No token or cookie in response from {self.auth_url}")
+        return {"token": token, "cookies": cookies}
+
+    def inject(self, sb, auth):
+        """
+        Loads the token and cookies into the browser before the first navigation.
+
+        Args:
+            sb (BaseCase): The test case with a fresh browser.
+            auth (dict): The result of authenticate().
+
+        Returns:
+            None
+        """
+        sb.open(self.origin)
+        for cookie in auth["cookies"]:
+            sb.driver.add_cookie(cookie)
+        if auth["token"]:
+            sb.execute_script(
+                "window.localStorage.setItem(arguments[0], arguments[1]);",
+                self.token_storage_key,
+                auth["token"],
+            )
+
+    def login(self, sb, username, password):
+        """
+        Authenticates over HTTP and opens the app as a logged-in user.
+
+        Args:
+            sb (BaseCase): The test case with a fresh browser.
+            username (str): The user email.
+            password (str): The user password.
+
+        Returns:
+            None
+        """
+        self.inject(sb, self.authenticate(username, password))
+        sb.open(self.base_url)
+        self.log.info(f"Logged in over HTTP via {self.auth_url}")
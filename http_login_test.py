@@ -0,0 +1,29 @@
+import pytest
+import requests
+import stand_in_server
+from http_login import HttpLogin
+
+
+@pytest.fixture(scope="module")
+def server():
+    server = stand_in_server.serve(username="user@example.com", password="secret", items=[])
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_authenticate_returns_token_and_session_cookie(server):
+    auth = HttpLogin(server.url).authenticate("user@example.com", "secret")
+    assert auth["token"]
+    assert [cookie["name"] for cookie in auth["cookies"]] == ["session"]
+    assert auth["cookies"][0]["value"] == auth["token"]
+    me = requests.get(
+        f"{server.url}/api/auth/me", headers={"Authorization": f"Bearer {auth['token']}"}
+    )
+    assert me.json() == {"email": "user@example.com"}
+
+
+def test_authenticate_rejects_bad_credentials(server):
+    login = HttpLogin(server.url, auth_url=f"{server.url}/api/auth/login")
+    with pytest.raises(requests.HTTPError):
+        login.authenticate("user@example.com", "wrong")
@@ -0,0 +1,186 @@
+import os
+import json
+import time
+import statistics
+import pytest
+
+HISTORY_PATH = ".durations_history.json"
+
+
+class DurationHistory:
+    """
+    Per-test durations observed in earlier runs.
+
+    Args:
+        path (str): JSON file mapping test node ids to recent durations.
+        max_samples (int): Durations kept per test.
+    """
+
+    def __init__(self, path=HISTORY_PATH, max_samples=10):
+        self.path = path
+        self.max_samples = max_samples
+        try:
+            with open(path) as file:
+                self.durations = json.load(file)
+        except (OSError, ValueError):
+            self.durations = {}
+
+    def estimate(self, nodeid):
+        """
+        Returns the expected duration of a test.
+
+        Args:
+            nodeid (str): The pytest node id.
+
+        Returns:
+            float: The median of its recent durations; tests without history
+                get the median over all known tests, or 1 second.
+        """
+        samples = self.durations.get(nodeid)
+        if samples:
+            return statistics.median(samples)
+        known = [statistics.median(s) for s in self.durations.values() if s]
+        return statistics.median(known) if known else 1.0
+
+    def save(self, observed):
+        """
+        Adds the durations of this run and writes the file.
+
+        Args:
+            observed (dict): Node id to the duration measured in this run.
+
+        Returns:
+            None
+        """
+        for nodeid, duration in observed.items():
+            samples = self.durations.get(nodeid, []) + [round(duration, 3)]
+            self.durations[nodeid] = samples[-self.max_samples :]
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(self.durations, file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def lpt_assign(estimates, workers):
+    """
+    Assigns jobs to workers, longest first, each to the least loaded worker.
+
+    Args:
+        estimates (list): Expected duration of each job.
+        workers (list): The workers.
+
+    Returns:
+        tuple: Worker to the sorted job indices, and worker to its load.
+    """
+    loads = {worker: 0.0 for worker in workers}
+    assignment = {worker: [] for worker in workers}
+    for index in sorted(range(len(estimates)), key=lambda i: -estimates[i]):
+        worker = min(workers, key=loads.get)
+        assignment[worker].append(index)
+        loads[worker] += estimates[index]
+    for indices in assignment.values():
+        indices.sort()
+    return assignment, loads
+
+
+def make_lpt_scheduling(plugin):
+    from xdist.scheduler import LoadScheduling
+
+    class LPTScheduling(LoadScheduling):
+        """
+        Sends every test up front, binned across workers with
+        longest-processing-time-first on the historical durations.
+        """
+
+        def schedule(self):
+            assert self.collection_is_completed
+            if self.collection is not None:
+                for node in self.nodes:
+                    self.check_schedule(node)
+                return
+            if not self._check_nodes_have_same_collection():
+                self.log("**Different tests collected, aborting run**")
+                return
+            self.collection = list(self.node2collection.values())[0]
+            if not self.collection:
+                return
+            estimates = [plugin.history.estimate(nodeid) for nodeid in self.collection]
+            assignment, loads = lpt_assign(estimates, self.nodes)
+            plugin.predicted = {node.gateway.id: load for node, load in loads.items()}
+            for node, indices in assignment.items():
+                if indices:
+                    self.node2pending[node].extend(indices)
+                    node.send_runtest_some(indices)
+            for node in self.nodes:
+                node.shutdown()
+
+    return LPTScheduling
+
+
+class DurationSchedulingPlugin:
+    """
+    Records per-test durations on the controller and, with --lpt, replaces
+    xdist's load distribution with LPT bin packing. Predicted and actual
+    makespan are reported at the end of the session.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.history = DurationHistory()
+        self.observed = {}
+        self.per_worker = {}
+        self.predicted = None
+        self.started = time.monotonic()
+
+    @pytest.hookimpl(optionalhook=True, tryfirst=True)
+    def pytest_xdist_make_scheduler(self, config, log):
+        if config.getoption("lpt"):
+            return make_lpt_scheduling(self)(config, log)
+
+    def pytest_runtest_logreport(self, report):
+        # Only the call phase is the test's own cost: the setup of whichever
+        # test runs first on a worker also pays for the session fixtures
+        # (browser launch, login, navigation).
+        if report.when == "call":
+            self.observed[report.nodeid] = report.duration
+        node = getattr(report, "node", None)
+        worker = node.gateway.id if node is not None else "main"
+        self.per_worker[worker] = self.per_worker.get(worker, 0.0) + report.duration
+
+    def pytest_sessionfinish(self, session):
+        if self.observed:
+            self.history.save(self.observed)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.per_worker:
+            return
+        wall_clock = time.monotonic() - self.started
+        actual = max(self.per_worker.values())
+        terminalreporter.write_sep("-", "test scheduling")
+        if self.predicted:
+            terminalreporter.write_line(
+                f"predicted makespan: {max(self.predicted.values()):.2f}s"
+            )
+        terminalreporter.write_line(
+            f"actual makespan: {actual:.2f}s (wall clock {wall_clock:.2f}s)"
+        )
+        for worker, busy in sorted(self.per_worker.items()):
+            predicted = (self.predicted or {}).get(worker)
+            expected = f", predicted {predicted:.2f}s" if predicted is not None else ""
+            terminalreporter.write_line(f"  {worker}: {busy:.2f}s{expected}")
+
+
+def pytest_addoption(parser):
+    parser.getgroup("xdist").addoption(
+        "--lpt",
+        action="store_true",
+        help="distribute tests across xdist workers longest-first, "
+        f"using the durations recorded in {HISTORY_PATH}",
+    )
+
+
+def pytest_configure(config):
+    if not hasattr(config, "workerinput"):
+        config.pluginmanager.register(
+            DurationSchedulingPlugin(config), "duration_scheduling"
+        )
@@ -0,0 +1,52 @@
+from lpt_scheduler import DurationHistory, DurationSchedulingPlugin, lpt_assign
+
+
+def test_longest_jobs_go_to_the_least_loaded_worker():
+    assignment, loads = lpt_assign([7, 5, 4, 3, 3, 2], ["gw0", "gw1"])
+    assert assignment == {"gw0": [0, 3, 5], "gw1": [1, 2, 4]}
+    assert loads == {"gw0": 12, "gw1": 12}
+
+
+def test_every_job_is_assigned_once():
+    estimates = [(index * 37) % 11 + 0.5 for index in range(40)]
+    assignment, loads = lpt_assign(estimates, ["gw0", "gw1", "gw2"])
+    assigned = sorted(index for indices in assignment.values() for index in indices)
+    assert assigned == list(range(40))
+    for worker, indices in assignment.items():
+        assert loads[worker] == sum(estimates[index] for index in indices)
+    # LPT is within 4/3 of the optimal makespan, which is at least the mean.
+    assert max(loads.values()) <= 4 / 3 * max(sum(estimates) / 3, max(estimates))
+
+
+def test_more_workers_than_jobs():
+    assignment, loads = lpt_assign([1.0], ["gw0", "gw1"])
+    assert sorted(assignment.values()) == [[], [0]]
+
+
+def test_history_estimates_and_save(tmp_path):
+    path = str(tmp_path / "durations.json")
+    history = DurationHistory(path, max_samples=2)
+    assert history.estimate("test_a") == 1.0
+    history.save({"test_a": 1.0, "test_b": 5.0})
+    history.save({"test_a": 3.0})
+    history.save({"test_a": 4.0})
+    history = DurationHistory(path, max_samples=2)
+    assert history.durations["test_a"] == [3.0, 4.0]
+    assert history.estimate("test_a") == 3.5
+    assert history.estimate("test_new") == 4.25
+
+
+def test_only_the_call_phase_is_recorded():
+    class Report:
+        def __init__(self, when, duration):
+            self.nodeid = "first_test.py::test_search"
+            self.when = when
+            self.duration = duration
+
+    plugin = DurationSchedulingPlugin.__new__(DurationSchedulingPlugin)
+    plugin.observed = {}
+    plugin.per_worker = {}
+    for when, duration in (("setup", 30.0), ("call", 2.0), ("teardown", 0.5)):
+        plugin.pytest_runtest_logreport(Report(when, duration))
+    assert plugin.observed == {"first_test.py::test_search": 2.0}
+    assert plugin.per_worker == {"main": 32.5}
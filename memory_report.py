@@ -0,0 +1,94 @@
+import uuid
+import tracemalloc
+import dataset
+from coa_store import ChartOfAccountsStore
+
+
+def replicate(items, count):
+    """
+    Yields count accounts cycling through items, each with a fresh id and
+    number. Strings are copied so that, as when read from JSON, no two
+    accounts share a string object.
+
+    Args:
+        items (list): Template accounts.
+        count (int): Number of accounts to yield.
+
+    Yields:
+        dict: An account.
+    """
+    for index in range(count):
+        item = dict(items[index % len(items)])
+        item["id"] = str(uuid.UUID(int=index + 1))
+        item["number"] = 10_000_000 + index
+        for field, value in item.items():
+            if isinstance(value, str):
+                item[field] = "".join(value)
+        yield item
+
+
+def measure(build, source):
+    """
+    Returns the memory a layout keeps alive once built from a stream of
+    accounts.
+
+    The stream is consumed while memory is traced, so every object the layout
+    keeps (its strings and ints included) is charged to it, and the accounts
+    it only reads are not.
+
+    Args:
+        build (callable): Builds the layout from an iterable of accounts.
+        source (iterable): The accounts.
+
+    Returns:
+        int: Bytes still allocated after the build.
+    """
+    tracemalloc.start()
+    try:
+        kept = build(source)
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del kept
+    return size
+
+
+def memory_report(sizes=(270, 100_000, 1_000_000), measure_limit=200_000):
+    """
+    Compares the memory of the dict form of a chart with the
+    ChartOfAccountsStore the oracle uses, both built from the same accounts.
+
+    Sizes above measure_limit are extrapolated from the largest measured size
+    to keep the report from needing gigabytes of RAM.
+
+    Args:
+        sizes (tuple): Numbers of accounts to report on.
+        measure_limit (int): Largest size actually built.
+
+    Returns:
+        list: One (size, dict bytes, store bytes, extrapolated) per size.
+    """
+    items = dataset.items()
+    report = []
+    per_account = None
+    for size in sizes:
+        if size > measure_limit and per_account is not None:
+            dict_bytes = int(per_account[0] * size)
+            store_bytes = int(per_account[1] * size)
+            report.append((size, dict_bytes, store_bytes, True))
+            continue
+        dict_bytes = measure(list, replicate(items, size))
+        store_bytes = measure(ChartOfAccountsStore.from_items, replicate(items, size))
+        per_account = (dict_bytes / size, store_bytes / size)
+        report.append((size, dict_bytes, store_bytes, False))
+    return report
+
+
+if __name__ == "__main__":
+    print(f"{'accounts':>10} {'dicts':>12} {'store':>12} {'ratio':>6}")
+    for size, dict_bytes, store_bytes, extrapolated in memory_report():
+        note = " (extrapolated)" if extrapolated else ""
+        print(
+            f"{size:>10} {dict_bytes / 2**20:>10.1f}MB {store_bytes / 2**20:>10.1f}MB "
+            f"{dict_bytes / store_bytes:>5.1f}x{note}"
+        )
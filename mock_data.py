@@ -4323,10 +4323,11 @@ data = {
     ]
 }
 
-# Save the data to a Python file
-file_path = "data.py"
-with open(file_path, "w") as file:
-    file.write("data = ")
-    file.write(repr(data))  
+if __name__ == "__main__":
+    # Save the data to a Python file
+    file_path = "data.py"
+    with open(file_path, "w") as file:
+        file.write("data = ")
+        file.write(repr(data))
 
-print(f"Data has been saved to {file_path}")
\ No newline at end of file
+    print(f"Data has been saved to {file_path}")
\ No newline at end of file
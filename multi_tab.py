@@ -0,0 +1,101 @@
+import time
+import logging
+
+
+class TabScheduler:
+    """
+    Runs several independent cases in tabs of one browser, interleaving
+    their steps so that one tab's server wait overlaps with work in others.
+
+    A case is a generator that drives the current tab and yields a condition
+    (a callable without arguments) whenever it has to wait. The scheduler
+    switches to the next tab instead of blocking, and resumes the case once
+    its condition returns True.
+
+    Args:
+        sb (BaseCase): The SeleniumBase session whose browser hosts the tabs.
+        timeout (float): Seconds a case may spend waiting on one condition.
+        poll_interval (float): Pause after a round where no tab made progress.
+        logger (logging.Logger): Where progress is logged.
+    """
+
+    def __init__(self, sb, timeout=30, poll_interval=0.05, logger=None):
+        self.sb = sb
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.log = logger or logging.getLogger(__name__)
+
+    def open_tabs(self, url, count):
+        """
+        Opens tabs on a URL without waiting for them to load.
+
+        Args:
+            url (str): The page each tab opens.
+            count (int): Number of tabs.
+
+        Returns:
+            list: The window handles of the new tabs.
+        """
+        driver = self.sb.driver
+        before = set(driver.window_handles)
+        for _ in range(count):
+            driver.execute_script("window.open(arguments[0], '_blank');", url)
+        return [h for h in driver.window_handles if h not in before]
+
+    def run(self, url, cases):
+        """
+        Opens one tab per case and runs the cases to completion.
+
+        Args:
+            url (str): The page each tab opens.
+            cases (dict): Case name to a callable returning the case generator.
+
+        Returns:
+            dict: Case name to the exception it raised, or None if it passed.
+        """
+        driver = self.sb.driver
+        home = driver.current_window_handle
+        handles = self.open_tabs(url, len(cases))
+        running = {}
+        for handle, (name, case) in zip(handles, cases.items()):
+            driver.switch_to.window(handle)
+            running[handle] = [name, case(), lambda: True, time.monotonic()]
+        results = {}
+        start = time.monotonic()
+        while running:
+            progressed = False
+            for handle in list(running):
+                name, steps, condition, waiting_since = running[handle]
+                driver.switch_to.window(handle)
+                try:
+                    ready = condition()
+                except Exception:
+                    ready = False
+                if not ready:
+                    if time.monotonic() - waiting_since > self.timeout:
+                        results[name] = TimeoutError(f"{name} timed out waiting")
+                        del running[handle]
+                    continue
+                progressed = True
+                try:
+                    running[handle][2] = next(steps)
+                    running[handle][3] = time.monotonic()
+                except StopIteration:
+                    results[name] = None
+                    del running[handle]
+                except Exception as e:
+                    self.log.error(f"Tab case {name} failed: {e}")
+                    results[name] = e
+                    del running[handle]
+            if not progressed:
+                time.sleep(self.poll_interval)
+        for handle in handles:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(home)
+        passed = sum(1 for error in results.values() if error is None)
+        self.log.info(
+            f"Ran {len(cases)} cases in tabs in {time.monotonic() - start:.2f}s, "
+            f"{passed} passed"
+        )
+        return results
@@ -0,0 +1,148 @@
+import time
+import logging
+from route_resolver import CHART_OF_ACCOUNTS_PREFIX
+
+
+class ChartOfAccountsNavigator:
+    """
+    Brings the browser to the Chart of Accounts grid of a fund.
+
+    Once the client is selected it opens the fund route directly and only
+    falls back to clicking through the sidebar and the general ledger menu
+    when the route is unknown or the deep link does not show the grid. Routes
+    found by clicking are stored in the resolver. Time-to-grid is logged for
+    whichever path was taken.
+
+    Args:
+        sb (BaseCase): The SeleniumBase test case driving the browser.
+        base_url (str): The application URL (BASE_URL).
+        settle (SettleEngine): Used for the waits between clicks.
+        network (NetworkIdle): Used to wait for the client selection calls.
+        timeouts (AdaptiveTimeouts): Used for the element waits.
+        resolver (FundRouteResolver): Maps client/fund names to routes.
+        discoverers (list): Extra route lookups (e.g. an API call) tried
+            before the click path; see FundRouteResolver.resolve().
+        logger (logging.Logger): Where progress is logged.
+    """
+
+    def __init__(
+        self,
+        sb,
+        base_url,
+        settle,
+        network,
+        timeouts,
+        resolver,
+        discoverers=(),
+        logger=None,
+    ):
+        self.sb = sb
+        self.base_url = base_url.rstrip("/")
+        self.settle = settle
+        self.network = network
+        self.timeouts = timeouts
+        self.resolver = resolver
+        self.discoverers = list(discoverers)
+        self.log = logger or logging.getLogger(__name__)
+        self.timings = []
+
+    def select_client(self, client_name):
+        """
+        Selects the client in the #selector-client autocomplete.
+
+        Args:
+            client_name (str): The client to select.
+
+        Returns:
+            None
+        """
+        self.timeouts.wait_visible(self.sb, "client_selector", "input#selector-client")
+        self.sb.type("//input[@id='selector-client']", client_name)
+        self.network.mark()
+        self.sb.click(f"//ul[@role='listbox']//li[contains(text(), '{client_name}')]")
+        self.network.wait_for_idle(label=f"select client {client_name}")
+
+    def open_by_deep_link(self, route):
+        """
+        Opens the Chart of Accounts route of a fund directly.
+
+        Args:
+            route (str): The Chart of Accounts route of the fund.
+
+        Returns:
+            bool: True if the grid was shown.
+        """
+        self.sb.open(self.base_url + route)
+        try:
+            self.timeouts.wait_visible(self.sb, "deep_link_grid", "div[role='grid']")
+        except Exception as e:
+            self.log.warning(f"Deep link to {route} did not show the grid: {e}")
+            return False
+        if route not in self.sb.get_current_url():
+            self.log.warning(f"Deep link to {route} was redirected")
+            return False
+        return True
+
+    def open_by_clicks(self, fund_name):
+        """
+        Reaches the Chart of Accounts through the sidebar and menus.
+
+        Args:
+            fund_name (str): The fund display name in the funds list.
+
+        Returns:
+            str: The Chart of Accounts route read from the menu item.
+        """
+        self.sb.click("#expand_collapse_sidebar")
+        self.sb.click("#funds_menu_option")
+        self.settle.until("sidebar_expanded", legacy_sleep=2, fund_name=fund_name)
+        self.timeouts.wait_visible(
+            self.sb, "fund_link", f"//span[text()='{fund_name}']"
+        ).click()
+        self.sb.assert_element_visible("button#general_ledger")
+        self.sb.find_element("button#general_ledger").click()
+        self.timeouts.wait_visible(self.sb, "general_ledger_menu", "ul.MuiList-root")
+        self.settle.until("menu_open", legacy_sleep=2)
+        menu_item = self.timeouts.wait_visible(
+            self.sb,
+            "chart_of_accounts_link",
+            f'a[role="menuitem"][href^="{CHART_OF_ACCOUNTS_PREFIX}"]',
+        )
+        route = menu_item.get_dom_attribute("href")
+        menu_item.click()
+        self.settle.until("grid_rerendered", legacy_sleep=2)
+        return route
+
+    def open(self, client_name, fund_name):
+        """
+        Selects the client and opens the fund's Chart of Accounts.
+
+        Args:
+            client_name (str): The client to select.
+            fund_name (str): The fund display name.
+
+        Returns:
+            str: "deep_link" or "clicks", the path that reached the grid.
+        """
+        self.select_client(client_name)
+        start = time.monotonic()
+        clicked = []
+
+        def discover_by_clicks(client_name, fund_name):
+            clicked.append(fund_name)
+            return self.open_by_clicks(fund_name)
+
+        entry = self.resolver.resolve(
+            client_name, fund_name, *self.discoverers, discover_by_clicks
+        )
+        path = "clicks" if clicked else "deep_link"
+        if not clicked and not self.open_by_deep_link(entry["route"]):
+            path = "clicks"
+            self.resolver.invalidate(client_name, fund_name)
+            self.sb.open(self.base_url)
+            self.select_client(client_name)
+            self.resolver.put(client_name, fund_name, self.open_by_clicks(fund_name))
+        elapsed = time.monotonic() - start
+        self.timings.append((path, elapsed))
+        self.log.info(f"Time to grid via {path}: {elapsed:.2f}s")
+        return path
@@ -0,0 +1,68 @@
+import os
+import gzip
+import json
+
+
+def open_text(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def read(path):
+    """
+    Reads accounts from a newline-delimited JSON file, one at a time.
+
+    Only the current line is held in memory, so exports of any size can be
+    fed to ChartOfAccountsStore.from_items() and the like. Blank lines are
+    skipped; files ending in .gz are decompressed on the fly.
+
+    Args:
+        path (str): The file.
+
+    Raises:
+        ValueError: If a line is not valid JSON.
+
+    Yields:
+        dict: An account.
+    """
+    with open_text(path, "r") as file:
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as error:
+                raise ValueError(f"{path}:{line_number}: {error.msg}") from error
+
+
+def write(path, items):
+    """
+    Writes accounts to a newline-delimited JSON file, one per line.
+
+    Items are consumed one at a time, so a generator is never materialised.
+    The file is written next to its destination and moved into place at the
+    end, so readers never see a partial export. Files ending in .gz are
+    compressed.
+
+    Args:
+        path (str): The file.
+        items (iterable): The accounts.
+
+    Returns:
+        int: The number of accounts written.
+    """
+    directory, name = os.path.split(path)
+    temporary = os.path.join(directory, f".{os.getpid()}.{name}")
+    written = 0
+    try:
+        with open_text(temporary, "w") as file:
+            for item in items:
+                file.write(json.dumps(item, separators=(",", ":")))
+                file.write("\n")
+                written += 1
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+    return written
@@ -0,0 +1,37 @@
+import os
+import pytest
+import dataset
+import ndjson
+
+
+@pytest.mark.parametrize("name", ["chart.jsonl", "chart.jsonl.gz"])
+def test_round_trip(tmp_path, name):
+    items = list(dataset.stream())
+    path = str(tmp_path / name)
+    assert ndjson.write(path, iter(items)) == len(items)
+    assert list(ndjson.read(path)) == items
+    assert os.listdir(tmp_path) == [name]
+
+
+def test_blank_lines_are_skipped(tmp_path):
+    path = tmp_path / "chart.jsonl"
+    path.write_text('{"number": 1}\n\n  \n{"number": 2}\n', encoding="utf-8")
+    assert list(ndjson.read(str(path))) == [{"number": 1}, {"number": 2}]
+
+
+def test_bad_lines_name_the_line(tmp_path):
+    path = tmp_path / "chart.jsonl"
+    path.write_text('{"number": 1}\n{"number": \n', encoding="utf-8")
+    with pytest.raises(ValueError, match="chart.jsonl:2"):
+        list(ndjson.read(str(path)))
+
+
+def test_failed_write_leaves_nothing_behind(tmp_path):
+    def items():
+        yield {"number": 1}
+        raise RuntimeError("export interrupted")
+
+    path = str(tmp_path / "chart.jsonl")
+    with pytest.raises(RuntimeError):
+        ndjson.write(path, items())
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,151 @@
+import re
+import json
+import time
+import logging
+
+FINISHED_EVENTS = ("Network.loadingFinished", "Network.loadingFailed")
+
+
+class NetworkIdle:
+    """
+    Waits for the XHR/fetch calls triggered by a step to finish, using the
+    Chrome DevTools Protocol Network events from the performance log.
+
+    The browser must be started with performance logging enabled
+    (``SB(log_cdp=True)``, see browser_pool.py). Without it, ``available`` is
+    False and callers should fall back to the settle engine.
+
+    A wait only ends once a tracked request has started and finished since
+    mark(), or, for actions that send none, once grace_ms has passed.
+
+    Args:
+        sb (BaseCase): The SeleniumBase test case driving the browser.
+        include (list): URL regexes to track. Empty means every request.
+        exclude (list): URL regexes to ignore, e.g. analytics or long-polling.
+        idle_ms (int): How long there must be no request in flight.
+        grace_ms (int): How long to wait for the first request after mark()
+            before treating the action as one that sends none.
+        resource_types (tuple): CDP resource types to track.
+        logger (logging.Logger): Where progress is logged.
+    """
+
+    def __init__(
+        self,
+        sb,
+        include=None,
+        exclude=None,
+        idle_ms=250,
+        grace_ms=1000,
+        resource_types=("XHR", "Fetch"),
+        logger=None,
+    ):
+        self.sb = sb
+        self.include = [re.compile(p) for p in include or []]
+        self.exclude = [re.compile(p) for p in exclude or []]
+        self.idle_ms = idle_ms
+        self.grace_ms = grace_ms
+        self.resource_types = resource_types
+        self.log = logger or logging.getLogger(__name__)
+        self.in_flight = {}
+        self.started = 0
+        self.completed = 0
+        self.marked_at = self.last_activity = time.monotonic()
+        self._available = None
+
+    @property
+    def available(self):
+        if self._available is None:
+            try:
+                self.sb.driver.get_log("performance")
+                self._available = True
+            except Exception as e:
+                self.log.warning(f"CDP performance log not available: {e}")
+                self._available = False
+        return self._available
+
+    def tracks(self, url):
+        """
+        Checks a URL against the include and exclude patterns.
+
+        Args:
+            url (str): The request URL.
+
+        Returns:
+            bool: True if requests to this URL should block the wait.
+        """
+        if self.include and not any(p.search(url) for p in self.include):
+            return False
+        return not any(p.search(url) for p in self.exclude)
+
+    def mark(self):
+        """
+        Forgets earlier traffic so the next wait only covers requests started
+        from now on. Call it right before the action.
+
+        Returns:
+            None
+        """
+        if not self.available:
+            return
+        self._drain()
+        self.in_flight.clear()
+        self.started = 0
+        self.completed = 0
+        self.marked_at = self.last_activity = time.monotonic()
+
+    def _drain(self):
+        for entry in self.sb.driver.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            method = message.get("method")
+            params = message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                url = params["request"]["url"]
+                if params.get("type") in self.resource_types and self.tracks(url):
+                    self.in_flight[params["requestId"]] = url
+                    self.started += 1
+                    self.last_activity = time.monotonic()
+            elif method in FINISHED_EVENTS:
+                if self.in_flight.pop(params.get("requestId"), None):
+                    self.completed += 1
+                    self.last_activity = time.monotonic()
+
+    def is_idle(self):
+        """
+        Checks, without blocking, whether the tracked traffic has finished.
+
+        Returns:
+            bool: True once a request has come and gone (or the grace period
+            passed without one) and nothing has been in flight for idle_ms.
+        """
+        if not self.available:
+            return True
+        self._drain()
+        now = time.monotonic()
+        if not self.started and (now - self.marked_at) * 1000 < self.grace_ms:
+            return False
+        quiet = (now - self.last_activity) * 1000
+        return not self.in_flight and quiet >= self.idle_ms
+
+    def wait_for_idle(self, timeout=10, label=None):
+        """
+        Blocks until the requests started since mark() have completed.
+
+        Args:
+            timeout (float): Seconds to wait before giving up.
+            label (str): Name of the step, used in the log.
+
+        Returns:
+            bool: True if the network went idle, False on timeout.
+        """
+        start = time.monotonic()
+        while not self.is_idle():
+            if time.monotonic() - start >= timeout:
+                pending = ", ".join(self.in_flight.values())
+                self.log.warning(f"Network not idle after {timeout}s ({label}): {pending}")
+                return False
+            time.sleep(0.05)
+        self.log.info(
+            f"Network idle after {time.monotonic() - start:.2f}s, "
+            f"{self.completed} requests ({label})"
+        )
+        return True
@@ -0,0 +1,123 @@
+from array import array
+
+CONTAINS = "contains"
+PREFIX = "prefix"
+
+
+class NGramIndex:
+    """
+    Inverted index of account names and numbers for substring search.
+
+    Every key (the name and the decimal number of each account) is split into
+    grams of 1 to n characters, each mapped to a posting list of rows. A
+    query intersects the posting lists of its grams, rarest first, and checks
+    the few remaining candidates, so it never scans every account.
+
+    Args:
+        store (ChartOfAccountsStore): The accounts.
+        n (int): Longest gram length.
+        case_fold (bool): Match names case-insensitively.
+        mode (str): CONTAINS to match anywhere in a key, PREFIX to match the
+            start of a key only.
+        postings (Mapping): Posting lists built earlier with the same n and
+            case_fold, e.g. mapped from a snapshot; built from the store if
+            None.
+    """
+
+    def __init__(self, store, n=3, case_fold=True, mode=CONTAINS, postings=None):
+        if mode not in (CONTAINS, PREFIX):
+            raise ValueError(f"Unknown search mode: {mode}")
+        self.store = store
+        self.n = n
+        self.case_fold = case_fold
+        self.mode = mode
+        if postings is not None:
+            self.postings = postings
+            return
+        self.postings = {}
+        names = store.strings["name"]
+        for row in range(len(store)):
+            for key in (names[row] or "", str(store.numbers[row])):
+                for gram in self.grams(self.normalize(key)):
+                    posting = self.postings.setdefault(gram, array("i"))
+                    if not posting or posting[-1] != row:
+                        posting.append(row)
+
+    def normalize(self, text):
+        return text.casefold() if self.case_fold else text
+
+    def grams(self, text):
+        """
+        Returns the distinct grams of 1 to n characters in a text.
+
+        Args:
+            text (str): The normalised text.
+
+        Returns:
+            set: The grams.
+        """
+        return {
+            text[start : start + size]
+            for size in range(1, self.n + 1)
+            for start in range(len(text) - size + 1)
+        }
+
+    def query_grams(self, term):
+        if len(term) <= self.n:
+            return [term]
+        return [term[i : i + self.n] for i in range(len(term) - self.n + 1)]
+
+    def matches(self, row, term):
+        names = self.store.strings["name"]
+        for key in (names[row] or "", str(self.store.numbers[row])):
+            key = self.normalize(key)
+            if key.startswith(term) if self.mode == PREFIX else term in key:
+                return True
+        return False
+
+    def estimate(self, term):
+        """
+        Returns an upper bound of the number of accounts a search matches,
+        without intersecting any posting list.
+
+        Args:
+            term (str): The search text.
+
+        Returns:
+            int: The length of the shortest posting list of the term's grams.
+        """
+        term = self.normalize(term)
+        if not term:
+            return len(self.store)
+        return min(len(self.postings.get(gram) or ()) for gram in set(self.query_grams(term)))
+
+    def search(self, term, verify_below=64):
+        """
+        Returns the accounts whose name or number matches a search term.
+
+        Args:
+            term (str): The search text.
+            verify_below (int): Stop intersecting posting lists once this few
+                candidates are left and check them directly.
+
+        Returns:
+            set: The matching rows.
+        """
+        term = self.normalize(term)
+        if not term:
+            return set(range(len(self.store)))
+        postings = []
+        for gram in set(self.query_grams(term)):
+            posting = self.postings.get(gram)
+            if posting is None:
+                return set()
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if len(candidates) < verify_below:
+                break
+            candidates.intersection_update(posting)
+        if len(term) <= self.n and self.mode == CONTAINS:
+            return candidates
+        return {row for row in candidates if self.matches(row, term)}
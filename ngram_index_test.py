@@ -0,0 +1,45 @@
+import pytest
+import synthetic_coa
+from coa_store import ChartOfAccountsStore
+from ngram_index import CONTAINS, PREFIX, NGramIndex
+
+TERMS = ["", "a", "Ca", "cash", "Cash Operating", "101", "1010001", "expense", "zzz", "e "]
+
+
+@pytest.fixture(scope="module")
+def store():
+    items = synthetic_coa.ChartProfile.learn().generate(3000, seed=2)
+    return ChartOfAccountsStore.from_items(items)
+
+
+def brute_force(store, term, mode, case_fold):
+    found = set()
+    for row in range(len(store)):
+        for key in (store.value("name", row) or "", str(store.numbers[row])):
+            if case_fold:
+                key, needle = key.casefold(), term.casefold()
+            else:
+                needle = term
+            if key.startswith(needle) if mode == PREFIX else needle in key:
+                found.add(row)
+    return found
+
+
+@pytest.mark.parametrize("mode", [CONTAINS, PREFIX])
+@pytest.mark.parametrize("case_fold", [True, False])
+def test_search_matches_brute_force(store, mode, case_fold):
+    index = NGramIndex(store, case_fold=case_fold, mode=mode)
+    for term in TERMS:
+        assert index.search(term) == brute_force(store, term, mode, case_fold), term
+
+
+def test_estimate_bounds_the_result(store):
+    index = NGramIndex(store)
+    for term in TERMS:
+        assert index.estimate(term) >= len(index.search(term)), term
+    assert index.estimate("zzz") == 0
+
+
+def test_rejects_unknown_modes(store):
+    with pytest.raises(ValueError):
+        NGramIndex(store, mode="suffix")
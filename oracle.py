@@ -0,0 +1,216 @@
+import logging
+from constants import (
+    COLUMN_ARK_TRANSACTION_FILTER,
+    COLUMN_ATTRIBUTE_FILTER,
+    COLUMN_FINANCIAL_STATEMENT_FILTER,
+    COLUMN_STATUS_FILTER,
+)
+
+# Account field each column filter matches on. ARK Transaction and Attribute
+# show a label of the attributeId; without a label table for the app under
+# test they are checked against the grid alone, see ResultOracle.unfiltered().
+COLUMN_FIELDS = {
+    COLUMN_ARK_TRANSACTION_FILTER: "attributeId",
+    COLUMN_ATTRIBUTE_FILTER: "attributeId",
+    COLUMN_FINANCIAL_STATEMENT_FILTER: "fsDisplayName",
+    COLUMN_STATUS_FILTER: "state",
+}
+
+
+class ResultOracle:
+    """
+    Computes which accounts the grid should show for a search or a column
+    filter, and diffs that against the rows extracted from the grid.
+
+    Rows are identified by the account number found among their cells, so the
+    oracle does not depend on the header names. Ancestors of expected accounts
+    may be shown (the grid renders matching children under their parents)
+    but are not required. Any other row, including one whose number is not
+    in the data, is unexpected.
+
+    Args:
+        store (ChartOfAccountsStore): The accounts, indexed.
+        attribute_labels (dict): attributeId to the label shown in the grid,
+            needed to build expectations for the Attribute filter.
+        logger (logging.Logger): Where skipped expectations are logged.
+        fund_id (str): The fund the grid shows. Account numbers are only
+            unique within a fund, so expectations are limited to its
+            accounts; None uses every account.
+        ark_transaction_labels (dict): attributeId to the type shown in the
+            ARK Transaction column, needed to build expectations for the ARK
+            Transaction filter.
+
+    Raises:
+        ValueError: If the store has no account in the fund.
+    """
+
+    def __init__(
+        self,
+        store,
+        attribute_labels=None,
+        logger=None,
+        fund_id=None,
+        ark_transaction_labels=None,
+    ):
+        self.store = store
+        # Column filter -> attributeId -> label, for the labelled columns.
+        self.labels = {
+            COLUMN_ATTRIBUTE_FILTER: attribute_labels or {},
+            COLUMN_ARK_TRANSACTION_FILTER: ark_transaction_labels or {},
+        }
+        self.log = logger or logging.getLogger(__name__)
+        self.hierarchy = store.build_hierarchy(self.log)
+        self.search_index = store.build_search_index()
+        self.fund = None
+        if fund_id is not None:
+            funds = store.strings["fundId"]
+            code = funds.code_of(fund_id)
+            if code is None:
+                raise ValueError(f"No account belongs to fund {fund_id}")
+            self.fund = bytes(map(code.__eq__, funds.codes))
+
+    def in_fund(self, row):
+        return self.fund is None or bool(self.fund[row])
+
+    def numbers_of(self, rows):
+        return {str(self.store.numbers[row]) for row in rows if self.in_fund(row)}
+
+    def row_of_number(self, number):
+        """
+        Returns the account of the fund shown with a number, through the
+        store's sorted index.
+
+        Args:
+            number (str): The number as the grid shows it.
+
+        Returns:
+            int: The row, or None if the fund has no such account.
+        """
+        if not number.isdigit():
+            return None
+        value = int(number)
+        for row in self.store.rows_in_number_range(value, value):
+            if self.in_fund(row):
+                return row
+        return None
+
+    def expected_for_search(self, term):
+        """
+        Returns the accounts matching a search by name or number.
+
+        Args:
+            term (str): The search text.
+
+        Returns:
+            set: The matching account numbers, as strings.
+        """
+        return self.numbers_of(self.search_index.search(term))
+
+    def expected_for_filter(self, column, filter_value):
+        """
+        Returns the accounts matching a column filter.
+
+        Args:
+            column (str): The column identifier.
+            filter_value (str): The value checked in the filter popover.
+
+        Returns:
+            set: The matching account numbers, or None if the column has no
+                counterpart in the data.
+        """
+        field = COLUMN_FIELDS.get(column)
+        if field is None:
+            self.log.info(f"No expectation for {column}: not in the data")
+            return None
+        accepted = {filter_value}
+        if column in self.labels:
+            accepted = {
+                value for value, label in self.labels[column].items() if label == filter_value
+            }
+            if not accepted:
+                self.log.info(f"No expectation for {column}: unknown label {filter_value}")
+                return None
+        rows = set()
+        for value in accepted:
+            rows.update(self.store.rows_where(field, value))
+        return self.numbers_of(rows)
+
+    def ancestors(self, numbers):
+        """
+        Returns the ancestors of the given accounts.
+
+        Args:
+            numbers (set): Account numbers, as strings.
+
+        Returns:
+            set: The account numbers of every ancestor.
+        """
+        found = set()
+        for number in numbers:
+            found.update(self.hierarchy.path_to_root(self.row_of_number(number)))
+        return self.numbers_of(found)
+
+    def account_number(self, row):
+        """
+        Returns the account number shown in an extracted grid row.
+
+        Args:
+            row (dict): Header text to cell text.
+
+        Raises:
+            ValueError: If the row shows no account number.
+
+        Returns:
+            str: The account number; a Number cell that is not in the data is
+                returned as is, so foreign rows show up as unexpected.
+        """
+        for value in row.values():
+            if self.row_of_number(value) is not None:
+                return value
+        for header, value in row.items():
+            if header.strip().casefold() == "number" and value:
+                return value
+        raise ValueError(f"Grid row shows no account number: {row}")
+
+    def diff(self, expected, rows):
+        """
+        Compares extracted grid rows with the expected accounts.
+
+        Args:
+            expected (set): The expected account numbers.
+            rows (list): Rows returned by extract_grid_rows().
+
+        Returns:
+            tuple: The expected numbers not shown, and the shown numbers that
+                are neither expected nor an ancestor of an expected account.
+        """
+        shown = {self.account_number(row) for row in rows}
+        missing = expected - shown
+        unexpected = shown - expected - self.ancestors(expected)
+        return missing, unexpected
+
+    def unfiltered(self, rows, header, filter_value):
+        """
+        Returns the shown accounts that a column filter should have hidden,
+        judged from the grid alone. Used when the data has no counterpart
+        for the column: every row must show the filter value, or be an
+        ancestor of a row that does.
+
+        Args:
+            rows (list): Rows returned by extract_grid_rows().
+            header (str): The header of the filtered column.
+            filter_value (str): The value checked in the filter popover.
+
+        Raises:
+            KeyError: If the rows have no such column.
+
+        Returns:
+            set: The account numbers shown without the filter value.
+        """
+        matching = set()
+        others = set()
+        for row in rows:
+            number = self.account_number(row)
+            (matching if row[header] == filter_value else others).add(number)
+        known = {number for number in matching if self.row_of_number(number) is not None}
+        return others - self.ancestors(known)
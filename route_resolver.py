@@ -0,0 +1,139 @@
+import os
+import json
+import time
+import logging
+import fasteners
+from urllib.parse import urlsplit
+
+CACHE_PATH = ".route_cache.json"
+CHART_OF_ACCOUNTS_PREFIX = "/fund-nav/chart-of-accounts/"
+
+
+class FundRouteResolver:
+    """
+    Maps (client, fund display name) to the fund id and its Chart of Accounts
+    route, and keeps the mapping on disk so later runs skip the discovery
+    clicks. Routes are cached per app origin, so the real app, the stand-in
+    and the fault proxy never reuse each other's routes.
+
+    Args:
+        path (str): JSON file holding the mapping, shared by all workers.
+        ttl (float): Seconds a cached route is trusted.
+        logger (logging.Logger): Where progress is logged.
+        base_url (str): The app the routes belong to; BASE_URL by default.
+    """
+
+    def __init__(self, path=CACHE_PATH, ttl=24 * 3600, logger=None, base_url=None):
+        self.path = path
+        self.ttl = ttl
+        self.log = logger or logging.getLogger(__name__)
+        self.lock = fasteners.InterProcessLock(path + ".lock")
+        parts = urlsplit(base_url or os.getenv("BASE_URL", ""))
+        self.origin = f"{parts.scheme}://{parts.netloc}"
+
+    def key(self, client_name, fund_name):
+        return f"{self.origin} {client_name}/{fund_name}"
+
+    def _load(self):
+        try:
+            with open(self.path) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _write(self, routes):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(routes, file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def get(self, client_name, fund_name):
+        """
+        Returns the cached route of a fund if it has not expired.
+
+        Args:
+            client_name (str): The client the fund belongs to.
+            fund_name (str): The fund display name.
+
+        Returns:
+            dict: The fund_id and route, or None.
+        """
+        entry = self._load().get(self.key(client_name, fund_name))
+        if entry is None or time.time() - entry["resolved_at"] > self.ttl:
+            return None
+        return entry
+
+    def put(self, client_name, fund_name, route):
+        """
+        Stores the route of a fund.
+
+        Args:
+            client_name (str): The client the fund belongs to.
+            fund_name (str): The fund display name.
+            route (str): The Chart of Accounts route of the fund.
+
+        Raises:
+            ValueError: If the route is not a Chart of Accounts route.
+
+        Returns:
+            dict: The stored fund_id and route.
+        """
+        if not route.startswith(CHART_OF_ACCOUNTS_PREFIX):
+            raise ValueError(f"Not a Chart of Accounts route: {route}")
+        entry = {
+            "fund_id": route[len(CHART_OF_ACCOUNTS_PREFIX) :].strip("/"),
+            "route": route,
+            "resolved_at": time.time(),
+        }
+        with self.lock:
+            routes = self._load()
+            routes[self.key(client_name, fund_name)] = entry
+            self._write(routes)
+        self.log.info(f"Resolved {client_name}/{fund_name} to {route}")
+        return entry
+
+    def invalidate(self, client_name, fund_name):
+        """
+        Drops the cached route of a fund.
+
+        Args:
+            client_name (str): The client the fund belongs to.
+            fund_name (str): The fund display name.
+
+        Returns:
+            None
+        """
+        with self.lock:
+            routes = self._load()
+            if routes.pop(self.key(client_name, fund_name), None) is not None:
+                self._write(routes)
+
+    def resolve(self, client_name, fund_name, *discoverers):
+        """
+        Returns the route of a fund, discovering it on a cache miss.
+
+        Args:
+            client_name (str): The client the fund belongs to.
+            fund_name (str): The fund display name.
+            *discoverers (callable): Tried in order with (client_name,
+                fund_name); each returns the route or None, e.g. an API
+                lookup followed by the UI click path.
+
+        Raises:
+            LookupError: If no discoverer found the fund.
+
+        Returns:
+            dict: The fund_id and route.
+        """
+        entry = self.get(client_name, fund_name)
+        if entry is not None:
+            return entry
+        for discover in discoverers:
+            try:
+                route = discover(client_name, fund_name)
+            except Exception as e:
+                self.log.warning(f"Route discovery failed for {fund_name}: {e}")
+                continue
+            if route:
+                return self.put(client_name, fund_name, route)
+        raise LookupError(f"Could not resolve a route for {client_name}/{fund_name}")
@@ -0,0 +1,163 @@
+import time
+import logging
+
+
+def _login_redirect_done(sb):
+    return not sb.is_element_visible('input[name="password"]') and (
+        sb.is_element_visible("input#selector-client")
+    )
+
+
+def _sidebar_expanded(sb, fund_name=None):
+    if not sb.is_element_visible("#funds_menu_option"):
+        return False
+    if fund_name:
+        return sb.is_element_visible(f"//span[text()='{fund_name}']")
+    return True
+
+
+def _menu_open(sb):
+    return sb.is_element_visible("ul.MuiList-root") and sb.is_element_visible(
+        'a[role="menuitem"]'
+    )
+
+
+def _page_ready(sb):
+    return sb.execute_script("return document.readyState") == "complete"
+
+
+def _grid_rerendered(sb):
+    return (
+        _page_ready(sb)
+        and sb.is_element_visible("div[role='grid']")
+        and not sb.is_element_visible("div[role='grid'] [role='progressbar']")
+    )
+
+
+def _popover_open(sb):
+    return sb.is_element_visible("input#search_accounts_popover")
+
+
+def _popover_closed(sb):
+    return not sb.is_element_visible("div#popover_filter_text")
+
+
+CONDITIONS = {
+    "login_redirect_done": _login_redirect_done,
+    "sidebar_expanded": _sidebar_expanded,
+    "menu_open": _menu_open,
+    "page_ready": _page_ready,
+    "grid_rerendered": _grid_rerendered,
+    "popover_open": _popover_open,
+    "popover_closed": _popover_closed,
+}
+
+
+class SettleEngine:
+    """
+    Replaces fixed sleeps with waits that return as soon as the page reaches
+    a named condition.
+
+    Every call is compared against the fixed sleep it replaces, so the engine
+    can report how much wall-clock time it saved over a test.
+
+    Args:
+        sb (BaseCase): The SeleniumBase test case driving the browser.
+        logger (logging.Logger): Where progress and the summary are logged.
+        poll_interval (float): Seconds between condition checks.
+        timeouts (AdaptiveTimeouts): If given, timeouts are derived from the
+            run history and every settled wait is recorded into it.
+        margin (float): Seconds added to the legacy sleep to get the default
+            timeout, so a failed wait costs little more than the old sleep.
+    """
+
+    def __init__(self, sb, logger=None, poll_interval=0.1, timeouts=None, margin=1.0):
+        self.sb = sb
+        self.timeouts = timeouts
+        self.margin = margin
+        self.log = logger or logging.getLogger(__name__)
+        self.poll_interval = poll_interval
+        self.conditions = dict(CONDITIONS)
+        self.records = []
+
+    def register(self, name, condition):
+        """
+        Registers a named condition.
+
+        Args:
+            name (str): The condition name used in until().
+            condition (callable): Takes the test case (plus any keyword
+                arguments given to until()) and returns True once settled.
+
+        Returns:
+            None
+        """
+        self.conditions[name] = condition
+
+    def until(self, name, legacy_sleep, timeout=None, **kwargs):
+        """
+        Waits until the named condition holds.
+
+        Args:
+            name (str): The condition to wait for.
+            legacy_sleep (float): The fixed sleep this call replaces, in seconds.
+            timeout (float): Give up after this many seconds. Defaults to the
+                legacy sleep plus the margin, tightened by the adaptive
+                timeout once the step has history.
+            **kwargs: Extra arguments passed to the condition.
+
+        Returns:
+            bool: True if the condition was met, False on timeout.
+        """
+        condition = self.conditions[name]
+        if timeout is None:
+            timeout = legacy_sleep + self.margin
+            if self.timeouts:
+                timeout = min(self.timeouts.timeout_for(f"settle:{name}", timeout), timeout)
+        start = time.monotonic()
+        met = False
+        while True:
+            try:
+                met = bool(condition(self.sb, **kwargs))
+            except Exception as e:
+                self.log.debug(f"Settle condition {name} raised: {e}")
+                met = False
+            elapsed = time.monotonic() - start
+            if met or elapsed >= timeout:
+                break
+            time.sleep(self.poll_interval)
+        self.records.append((name, legacy_sleep, elapsed, met))
+        if met and self.timeouts:
+            self.timeouts.record(f"settle:{name}", elapsed)
+        if met:
+            self.log.debug(f"Settled '{name}' in {elapsed:.2f}s (was {legacy_sleep}s)")
+        else:
+            self.log.warning(f"Condition '{name}' not met after {elapsed:.2f}s")
+        return met
+
+    def saved_seconds(self):
+        """
+        Returns the wall-clock time saved compared with the fixed sleeps.
+
+        Returns:
+            float: Seconds saved; negative if the waits took longer.
+        """
+        return sum(legacy - elapsed for _, legacy, elapsed, _ in self.records)
+
+    def report(self):
+        """
+        Logs a summary of all waits made through the engine.
+
+        Returns:
+            None
+        """
+        if not self.records:
+            return
+        waited = sum(elapsed for _, _, elapsed, _ in self.records)
+        legacy = sum(legacy for _, legacy, _, _ in self.records)
+        misses = sum(1 for *_, met in self.records if not met)
+        self.log.info(
+            f"Settle engine: {len(self.records)} waits took {waited:.2f}s "
+            f"instead of {legacy:.2f}s, saved {self.saved_seconds():.2f}s "
+            f"({misses} timed out)"
+        )
@@ -0,0 +1,459 @@
+import sys
+import json
+import mmap
+import zlib
+import struct
+import argparse
+from array import array
+import dataset
+from hierarchy import AccountHierarchy
+from ngram_index import NGramIndex
+from coa_store import (
+    BOOLEAN_FIELDS,
+    HASH_INDEXED_FIELDS,
+    MISSING,
+    ChartOfAccountsStore,
+    UuidColumn,
+)
+
+MAGIC = b"COASNAP2"
+SUFFIX = ".coas"
+ALIGNMENT = 8
+EMPTY = -1
+HIERARCHY_ARRAYS = ("parent", "order", "enter", "leave", "depth")
+
+
+def padding(offset):
+    return -offset % ALIGNMENT
+
+
+def dictionary_columns(name, values):
+    """
+    Encodes distinct strings as a UTF-8 blob with offsets, plus an open
+    addressing hash table (crc32, linear probing) from value to code, so
+    readers find a code without decoding anything but the candidates.
+
+    Args:
+        name (str): Suffix of the column names.
+        values (list): The distinct strings; a value's code is its position.
+
+    Returns:
+        list: (name, typecode, array) per column to write.
+    """
+    offsets = array("q", [0])
+    blob = bytearray()
+    encoded = [value.encode("utf-8") for value in values]
+    for data in encoded:
+        blob += data
+        offsets.append(len(blob))
+    size = 1
+    while size < 2 * len(values):
+        size *= 2
+    table = array("i", [EMPTY]) * size
+    mask = size - 1
+    for code, data in enumerate(encoded):
+        slot = zlib.crc32(data) & mask
+        while table[slot] != EMPTY:
+            slot = (slot + 1) & mask
+        table[slot] = code
+    return [
+        (f"offsets:{name}", "q", offsets),
+        (f"blob:{name}", "B", array("B", blob)),
+        (f"hash:{name}", "i", table),
+    ]
+
+
+def grouped_rows(name, keys, count):
+    """
+    Groups rows by key (CSR): the rows of key k are
+    rows[offsets[k]:offsets[k + 1]], in row order.
+
+    Args:
+        name (str): Suffix of the column names.
+        keys (Sequence): The key of each row, MISSING for none.
+        count (int): Number of distinct keys.
+
+    Returns:
+        list: (name, typecode, array) per column to write.
+    """
+    offsets = array("q", [0]) * (count + 1)
+    for key in keys:
+        if key != MISSING:
+            offsets[key + 1] += 1
+    for key in range(count):
+        offsets[key + 1] += offsets[key]
+    rows = array("i", [0]) * offsets[-1]
+    cursor = array("q", offsets[:-1])
+    for row, key in enumerate(keys):
+        if key != MISSING:
+            rows[cursor[key]] = row
+            cursor[key] += 1
+    return [(f"index_offsets:{name}", "q", offsets), (f"index_rows:{name}", "i", rows)]
+
+
+def string_columns(field, column):
+    """
+    Dictionary-encodes a StringColumn with its values in sorted order.
+
+    Args:
+        field (str): The field name.
+        column (StringColumn): The column.
+
+    Returns:
+        list: (name, typecode, array) per column to write.
+    """
+    order = sorted(range(len(column.values)), key=column.values.__getitem__)
+    recode = array("i", [0]) * len(order)
+    for code, previous in enumerate(order):
+        recode[previous] = code
+    codes = array("i", (MISSING if code == MISSING else recode[code] for code in column.codes))
+    columns = [(f"codes:{field}", "i", codes)]
+    columns += dictionary_columns(field, [column.values[previous] for previous in order])
+    if field in HASH_INDEXED_FIELDS:
+        columns += grouped_rows(field, codes, len(order))
+    return columns
+
+
+def search_columns(index):
+    """
+    Flattens the posting lists of an NGramIndex: the grams as a dictionary
+    and the rows of each gram grouped by gram.
+
+    Args:
+        index (NGramIndex): The index.
+
+    Returns:
+        list: (name, typecode, array) per column to write.
+    """
+    grams = sorted(index.postings)
+    offsets = array("q", [0])
+    rows = array("i")
+    for gram in grams:
+        rows.extend(index.postings[gram])
+        offsets.append(len(rows))
+    return dictionary_columns("grams", grams) + [
+        ("posting_offsets", "q", offsets),
+        ("posting_rows", "i", rows),
+    ]
+
+
+def write(path, store):
+    """
+    Writes a store as a columnar snapshot.
+
+    The file is a header followed by fixed-width columns, each aligned to 8
+    bytes: number, the booleans, and per string field its codes, its sorted
+    dictionary (offsets into a UTF-8 blob, with a hash table from value to
+    code) and, for hash-indexed fields, the rows of each code. The sorted
+    index on number, the hierarchy arrays and the n-gram posting lists are
+    stored too, so readers build nothing.
+
+    Args:
+        path (str): The snapshot file.
+        store (ChartOfAccountsStore): The accounts.
+
+    Returns:
+        int: The size of the file in bytes.
+    """
+    if store.sorted_rows is None:
+        store.build_sorted_index()
+    hierarchy = AccountHierarchy(store)
+    search_index = NGramIndex(store)
+    columns = [("number", "q", store.numbers)]
+    columns += [
+        (f"bool:{field}", "b", array("b", store.booleans[field])) for field in BOOLEAN_FIELDS
+    ]
+    for field, column in store.strings.items():
+        if isinstance(column, UuidColumn):
+            column = column.as_strings()
+        columns += string_columns(field, column)
+    columns.append(("sorted_rows", "i", store.sorted_rows))
+    columns.append(("sorted_numbers", "q", store.sorted_numbers))
+    columns += [(name, "i", getattr(hierarchy, name)) for name in HIERARCHY_ARRAYS]
+    columns += search_columns(search_index)
+    layout = {}
+    offset = 0
+    for name, typecode, values in columns:
+        layout[name] = [offset, typecode, len(values)]
+        size = len(values) * values.itemsize
+        offset += size + padding(size)
+    header = json.dumps(
+        {
+            "rows": len(store),
+            "byteorder": sys.byteorder,
+            "columns": layout,
+            "orphans": hierarchy.orphans,
+            "cycles": hierarchy.cycles,
+            "search": {
+                "n": search_index.n,
+                "case_fold": search_index.case_fold,
+                "mode": search_index.mode,
+            },
+        }
+    ).encode("utf-8")
+    start = len(MAGIC) + 4 + len(header)
+    with open(path, "wb") as file:
+        file.write(MAGIC)
+        file.write(struct.pack("<I", len(header)))
+        file.write(header)
+        file.write(bytes(padding(start)))
+        for _, _, values in columns:
+            data = values.tobytes()
+            file.write(data)
+            file.write(bytes(padding(len(data))))
+        return file.tell()
+
+
+class MappedDictionary:
+    """
+    Distinct strings read straight from a snapshot, looked up through the
+    stored hash table.
+    """
+
+    def __init__(self, offsets, blob, table):
+        self.offsets = offsets
+        self.blob = blob
+        self.table = table
+        self.mask = len(table) - 1
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def decode(self, code):
+        return str(self.blob[self.offsets[code] : self.offsets[code + 1]], "utf-8")
+
+    def code_of(self, value):
+        """
+        Returns the code of a value.
+
+        Args:
+            value (str): The value.
+
+        Returns:
+            int: The code, or None if the value is not in the dictionary.
+        """
+        data = value.encode("utf-8")
+        slot = zlib.crc32(data) & self.mask
+        while True:
+            code = self.table[slot]
+            if code == EMPTY:
+                return None
+            if self.blob[self.offsets[code] : self.offsets[code + 1]] == data:
+                return code
+            slot = (slot + 1) & self.mask
+
+
+class MappedStringColumn:
+    """
+    A dictionary-encoded string column read straight from a snapshot.
+
+    Values are decoded only when asked for; codes follow the sorted order of
+    the values.
+    """
+
+    def __init__(self, codes, dictionary):
+        self.codes = codes
+        self.dictionary = dictionary
+
+    def __len__(self):
+        return len(self.dictionary)
+
+    def decode(self, code):
+        return self.dictionary.decode(code)
+
+    def __getitem__(self, row):
+        code = self.codes[row]
+        return None if code == MISSING else self.decode(code)
+
+    def code_of(self, value):
+        return self.dictionary.code_of(value)
+
+
+class MappedPostings:
+    """
+    The posting lists of an NGramIndex read straight from a snapshot; a
+    read-only stand-in for its gram -> rows dict.
+    """
+
+    def __init__(self, grams, offsets, rows):
+        self.grams = grams
+        self.offsets = offsets
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.grams)
+
+    def get(self, gram, default=None):
+        code = self.grams.code_of(gram)
+        if code is None:
+            return default
+        return self.rows[self.offsets[code] : self.offsets[code + 1]]
+
+
+class SnapshotStore(ChartOfAccountsStore):
+    """
+    A read-only ChartOfAccountsStore backed by a memory-mapped snapshot.
+
+    Columns are zero-copy memoryviews of the mapping, so opening a snapshot
+    costs no parsing, and every process that opens the same file (e.g. the
+    xdist workers) shares one page-cached copy. The hierarchy and the search
+    index are mapped as well rather than rebuilt. Release the store with
+    close() or by using it as a context manager.
+
+    Args:
+        path (str): The snapshot file written by write().
+
+    Raises:
+        ValueError: If the file is not a snapshot or was written on a machine
+            with a different byte order.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self.mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.views = []
+        try:
+            self._map(path)
+        except Exception:
+            self.close()
+            raise
+
+    def _map(self, path):
+        if self.mapping[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a chart of accounts snapshot")
+        (header_size,) = struct.unpack_from("<I", self.mapping, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(self.mapping[start : start + header_size])
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError(f"{path} was written with {header['byteorder']}-endian columns")
+        start += header_size
+        start += padding(start)
+        whole = memoryview(self.mapping)
+        self.views.append(whole)
+
+        def column(name):
+            offset, typecode, count = header["columns"][name]
+            view = whole[start + offset :][: count * array(typecode).itemsize].cast(typecode)
+            self.views.append(view)
+            return view
+
+        def dictionary(name):
+            return MappedDictionary(
+                column(f"offsets:{name}"), column(f"blob:{name}"), column(f"hash:{name}")
+            )
+
+        self.size = header["rows"]
+        self.numbers = column("number")
+        self.booleans = {field: column(f"bool:{field}") for field in BOOLEAN_FIELDS}
+        self.strings = {}
+        self.postings = {}
+        for name in header["columns"]:
+            kind, _, field = name.partition(":")
+            if kind == "codes":
+                self.strings[field] = MappedStringColumn(column(name), dictionary(field))
+            elif kind == "index_offsets":
+                self.postings[field] = (column(name), column(f"index_rows:{field}"))
+        self.sorted_rows = column("sorted_rows")
+        self.sorted_numbers = column("sorted_numbers")
+        self.hierarchy_arrays = {name: column(name) for name in HIERARCHY_ARRAYS}
+        self.orphans = header["orphans"]
+        self.cycles = header["cycles"]
+        self.search = header["search"]
+        self.search_postings = MappedPostings(
+            dictionary("grams"), column("posting_offsets"), column("posting_rows")
+        )
+
+    def close(self):
+        """
+        Releases the column views and unmaps the file.
+
+        Raises:
+            BufferError: If a caller still holds a slice of a column.
+        """
+        for view in reversed(self.views):
+            view.release()
+        self.views = []
+        self.mapping.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def append(self, item):
+        raise TypeError("A snapshot store is read-only")
+
+    def build_sorted_index(self):
+        pass
+
+    def build_hierarchy(self, logger=None):
+        """
+        Returns the hierarchy stored in the snapshot.
+
+        Args:
+            logger (logging.Logger): Unused; problems were reported on write.
+
+        Returns:
+            AccountHierarchy: The hierarchy, over the mapped arrays.
+        """
+        return AccountHierarchy.from_arrays(
+            self, orphans=self.orphans, cycles=self.cycles, **self.hierarchy_arrays
+        )
+
+    def build_search_index(self):
+        """
+        Returns the search index stored in the snapshot.
+
+        Returns:
+            NGramIndex: The index, over the mapped posting lists.
+        """
+        return NGramIndex(self, postings=self.search_postings, **self.search)
+
+    def rows_where(self, field, value):
+        """
+        Returns the rows whose field equals a value, through its stored index.
+
+        Args:
+            field (str): One of HASH_INDEXED_FIELDS.
+            value (str): The value to match.
+
+        Returns:
+            memoryview: The matching rows.
+        """
+        offsets, rows = self.postings[field]
+        code = self.strings[field].code_of(value)
+        if code is None:
+            return rows[:0]
+        return rows[offsets[code] : offsets[code + 1]]
+
+    def distinct(self, field):
+        column = self.strings[field]
+        return [column.decode(code) for code in range(len(column))]
+
+    def row_of_id(self, account_id):
+        rows = self.rows_where("id", account_id)
+        return rows[0] if len(rows) else None
+
+
+def convert(source, path):
+    """
+    Builds a snapshot from an NDJSON export (or mock_data if source is None).
+
+    Args:
+        source (str): The export.
+        path (str): The snapshot file.
+
+    Returns:
+        int: The size of the snapshot in bytes.
+    """
+    return write(path, ChartOfAccountsStore.from_items(dataset.stream(source)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a chart of accounts snapshot.")
+    parser.add_argument("output", help=f"Snapshot file (*{SUFFIX})")
+    parser.add_argument("--source", help="NDJSON export; mock_data.py by default")
+    arguments = parser.parse_args()
+    size = convert(arguments.source, arguments.output)
+    print(f"Wrote {size} bytes to {arguments.output}")
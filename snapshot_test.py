@@ -0,0 +1,73 @@
+import pytest
+import dataset
+import snapshot
+import synthetic_coa
+from coa_store import HASH_INDEXED_FIELDS, ChartOfAccountsStore
+from oracle import ResultOracle
+
+
+@pytest.fixture(scope="module")
+def store():
+    return ChartOfAccountsStore.from_items(dataset.stream())
+
+
+@pytest.fixture
+def mapped(store, tmp_path):
+    path = str(tmp_path / f"chart{snapshot.SUFFIX}")
+    snapshot.write(path, store)
+    with snapshot.SnapshotStore(path) as mapped:
+        yield mapped
+
+
+def test_rows_round_trip(store, mapped):
+    assert len(mapped) == len(store)
+    for row in range(len(store)):
+        assert mapped.row(row) == store.row(row)
+
+
+def test_index_lookups_match(store, mapped):
+    for field in HASH_INDEXED_FIELDS:
+        for value in store.distinct(field)[:50]:
+            assert list(mapped.rows_where(field, value)) == list(store.rows_where(field, value))
+        assert len(mapped.rows_where(field, "no such value")) == 0
+    for row in range(len(store)):
+        assert mapped.row_of_id(store.value("id", row)) == row
+    assert mapped.row_of_id("no such id") is None
+    assert list(mapped.rows_in_number_range(1010000, 1020000)) == list(
+        store.rows_in_number_range(1010000, 1020000)
+    )
+
+
+def test_hierarchy_and_search_are_mapped(store, mapped):
+    built = store.build_hierarchy()
+    stored = mapped.build_hierarchy()
+    for name in snapshot.HIERARCHY_ARRAYS:
+        assert list(getattr(stored, name)) == list(getattr(built, name))
+    built_index = store.build_search_index()
+    stored_index = mapped.build_search_index()
+    for term in ("Cash", "cash checking", "1010", "0", "Expense", "zzz", ""):
+        assert stored_index.search(term) == built_index.search(term)
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.coas"
+    path.write_bytes(b"not a snapshot at all")
+    with pytest.raises(ValueError):
+        snapshot.SnapshotStore(str(path))
+
+
+def test_oracle_construction_only_maps(tmp_path):
+    items = list(synthetic_coa.ChartProfile.learn().generate(2000, funds=2, seed=1))
+    store = ChartOfAccountsStore.from_items(items)
+    path = str(tmp_path / f"chart{snapshot.SUFFIX}")
+    snapshot.write(path, store)
+    fund_id = store.value("fundId", 0)
+    with snapshot.SnapshotStore(path) as mapped:
+        oracle = ResultOracle(mapped, fund_id=fund_id)
+        for name, column in mapped.hierarchy_arrays.items():
+            assert getattr(oracle.hierarchy, name) is column
+        assert oracle.search_index.postings is mapped.search_postings
+        expected = ResultOracle(store, fund_id=fund_id)
+        for term in ("Cash", "101"):
+            assert oracle.expected_for_search(term) == expected.expected_for_search(term)
+        del oracle
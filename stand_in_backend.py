@@ -0,0 +1,536 @@
+import json
+import time
+import base64
+import hashlib
+import logging
+import operator
+import argparse
+import statistics
+import threading
+from array import array
+from bisect import bisect_right
+from itertools import compress
+from collections import OrderedDict
+from hierarchy import NO_PARENT
+
+BOOLEAN_LABELS = {True: "Yes", False: "No"}
+# Grid column field -> account field, for the columns the grid can filter on.
+FILTER_FIELDS = {
+    "arkTransaction": "attributeId",
+    "attribute": "attributeId",
+    "fsDisplayName": "fsDisplayName",
+    "state": "state",
+    "isTaxable": "isTaxable",
+    "isEntityRequired": "isEntityRequired",
+    "doNotMap": "doNotMap",
+}
+# A streamed page gives up, and the query is computed in full, once it has
+# scanned this many times more positions than the estimate predicted.
+STREAM_SLACK = 20
+
+
+class FundChart:
+    """
+    Answers the stand-in grid's search, filter and paging requests for one
+    fund through indexes, so large charts respond without scanning.
+
+    Search goes through the n-gram index and filters through the store's hash
+    indexes (booleans get row lists of their own). Matching accounts are
+    returned with their ancestors, in tree (preorder) order, a page at a
+    time. A cursor holds the query digest and the preorder position of the
+    last row sent.
+
+    Selective queries are computed in full once and cached, so the next page
+    is a binary search into the result. Broad queries, for which computing
+    every match costs more than finding one page of them, are streamed: the
+    preorder is scanned from the cursor until the page is full.
+
+    Nothing is built up front: the hierarchy and the search index are built
+    on first use, or mapped when the store is a snapshot.
+
+    Args:
+        store (ChartOfAccountsStore): The accounts, e.g. a SnapshotStore.
+        attribute_labels (dict): attributeId to the label shown in the
+            Attribute column.
+        ark_transaction_labels (dict): attributeId to the type shown in the
+            ARK Transaction column.
+        cache_size (int): Query results kept for paging.
+        logger (logging.Logger): Where hierarchy problems are reported.
+        fund_id (str): Serve only this fund's accounts of a store holding
+            several funds; None serves every account.
+
+    Raises:
+        ValueError: If the store has no account in the fund.
+    """
+
+    def __init__(
+        self,
+        store,
+        attribute_labels=None,
+        ark_transaction_labels=None,
+        cache_size=32,
+        logger=None,
+        fund_id=None,
+    ):
+        self.store = store
+        # Grid column field -> account value -> label, for the columns that
+        # show a label instead of the value itself.
+        self.labels = {
+            "attribute": attribute_labels or {},
+            "arkTransaction": ark_transaction_labels or {},
+        }
+        self.cache_size = cache_size
+        self.log = logger or logging.getLogger(__name__)
+        self.fund = None
+        if fund_id is not None:
+            funds = store.strings["fundId"]
+            code = funds.code_of(fund_id)
+            if code is None:
+                raise ValueError(f"No account belongs to fund {fund_id}")
+            self.fund = bytes(map(code.__eq__, funds.codes))
+        self.built = {}
+        self.build_lock = threading.RLock()
+        self.results = OrderedDict()
+        self.results_lock = threading.Lock()
+
+    def lazily(self, name, build):
+        """
+        Returns a derived structure, building it on the first call only.
+
+        Args:
+            name (str): The structure.
+            build (callable): Builds it.
+
+        Returns:
+            object: The structure.
+        """
+        value = self.built.get(name)
+        if value is None:
+            with self.build_lock:
+                value = self.built.get(name)
+                if value is None:
+                    value = self.built[name] = build()
+        return value
+
+    @property
+    def hierarchy(self):
+        return self.lazily("hierarchy", lambda: self.store.build_hierarchy(self.log))
+
+    @property
+    def search_index(self):
+        return self.lazily("search_index", self.store.build_search_index)
+
+    @property
+    def boolean_rows(self):
+        return self.lazily("boolean_rows", self._boolean_rows)
+
+    @property
+    def size(self):
+        return self.lazily(
+            "size", lambda: len(self.store) if self.fund is None else self.fund.count(1)
+        )
+
+    def _boolean_rows(self):
+        everything = range(len(self.store))
+        rows = {}
+        for field, column in self.store.booleans.items():
+            true = bytes(map(bool, column))
+            false = bytes(map(operator.not_, column))
+            if self.fund is not None:
+                true = bytes(map(operator.and_, true, self.fund))
+                false = bytes(map(operator.and_, false, self.fund))
+            rows[field] = {
+                True: array("i", compress(everything, true)),
+                False: array("i", compress(everything, false)),
+            }
+        return rows
+
+    def present(self, field):
+        """
+        Returns the values of a hash-indexed field that the fund's accounts
+        have.
+
+        Args:
+            field (str): The account field.
+
+        Returns:
+            list: The values.
+        """
+        values = self.store.distinct(field)
+        if self.fund is None:
+            return values
+        return [
+            value
+            for value in values
+            if any(map(self.fund.__getitem__, self.store.rows_where(field, value)))
+        ]
+
+    def filter_values(self):
+        """
+        Returns the values each filterable column can be filtered on.
+
+        Returns:
+            dict: Grid column field to its sorted display values.
+        """
+        return self.lazily("filter_values", self._filter_values)
+
+    def _filter_values(self):
+        values = {
+            field: sorted(
+                {labels.get(value, value) for value in self.present(FILTER_FIELDS[field])}
+            )
+            for field, labels in self.labels.items()
+        }
+        values["fsDisplayName"] = sorted(self.present("fsDisplayName"))
+        values["state"] = sorted(self.present("state"))
+        for field, rows in self.boolean_rows.items():
+            values[field] = [BOOLEAN_LABELS[value] for value in (False, True) if rows[value]]
+        return values
+
+    def accepted_values(self, field, accepted):
+        """
+        Translates the display values accepted by a column filter into the
+        account values that show them.
+
+        Args:
+            field (str): A grid column field in FILTER_FIELDS.
+            accepted (list): Display values.
+
+        Raises:
+            KeyError: If the column cannot be filtered.
+
+        Returns:
+            list: Account values (True/False for the boolean columns).
+        """
+        account_field = FILTER_FIELDS[field]
+        if account_field in self.store.booleans:
+            return [value for value, label in BOOLEAN_LABELS.items() if label in accepted]
+        labels = self.labels.get(field)
+        if labels is None:
+            return list(accepted)
+        return [
+            value
+            for value in self.store.distinct(account_field)
+            if labels.get(value, value) in accepted
+        ]
+
+    def rows_for(self, field, accepted):
+        """
+        Returns the rows whose column shows one of the accepted values.
+
+        Args:
+            field (str): A grid column field in FILTER_FIELDS.
+            accepted (list): Display values.
+
+        Raises:
+            KeyError: If the column cannot be filtered.
+
+        Returns:
+            set: The matching rows.
+        """
+        rows = set()
+        values = self.accepted_values(field, accepted)
+        if field in self.store.booleans:
+            for value in values:
+                rows.update(self.boolean_rows[field][value])
+            return rows
+        for value in values:
+            rows.update(self.store.rows_where(FILTER_FIELDS[field], value))
+        return rows
+
+    def estimate(self, search, filters):
+        """
+        Returns an upper bound of the number of accounts a query matches,
+        from the index sizes alone.
+
+        Args:
+            search (str): Name or number text.
+            filters (dict): Grid column field to accepted display values.
+
+        Returns:
+            int: The bound.
+        """
+        bounds = [self.size]
+        if search:
+            bounds.append(self.search_index.estimate(search))
+        for field, accepted in filters.items():
+            values = self.accepted_values(field, accepted)
+            if field in self.store.booleans:
+                bounds.append(sum(len(self.boolean_rows[field][value]) for value in values))
+            else:
+                bounds.append(
+                    sum(len(self.store.rows_where(FILTER_FIELDS[field], value)) for value in values)
+                )
+        return min(bounds)
+
+    def matcher(self, search, filters):
+        """
+        Returns a check of whether a single account matches a query.
+
+        Args:
+            search (str): Name or number text.
+            filters (dict): Grid column field to accepted display values.
+
+        Returns:
+            callable: Takes a row, returns True if it matches.
+        """
+        checks = []
+        if self.fund is not None:
+            checks.append(self.fund.__getitem__)
+        for field, accepted in filters.items():
+            values = self.accepted_values(field, accepted)
+            if field in self.store.booleans:
+                column = self.store.booleans[field]
+                checks.append(lambda row, column=column, values=values: bool(column[row]) in values)
+            else:
+                column = self.store.strings[FILTER_FIELDS[field]]
+                codes = {column.code_of(value) for value in values} - {None}
+                checks.append(lambda row, column=column, codes=codes: column.codes[row] in codes)
+        if search:
+            index = self.search_index
+            term = index.normalize(search)
+            checks.append(lambda row: index.matches(row, term))
+        return lambda row: all(check(row) for check in checks)
+
+    def positions(self, search, filters):
+        """
+        Returns the preorder positions of the rows a query shows, sorted.
+
+        Args:
+            search (str): Name or number text.
+            filters (dict): Grid column field to accepted display values.
+
+        Returns:
+            Sequence: The positions (a range when nothing is filtered out).
+        """
+        size = len(self.store)
+        matched = None
+        if search:
+            matched = self.search_index.search(search)
+        for field, accepted in sorted(filters.items()):
+            rows = self.rows_for(field, accepted)
+            matched = rows if matched is None else matched & rows
+        if self.fund is not None:
+            if matched is None:
+                matched = compress(range(size), self.fund)
+            else:
+                matched = {row for row in matched if self.fund[row]}
+        if matched is None:
+            return range(size)
+        enter = self.hierarchy.enter
+        parent = self.hierarchy.parent
+        shown = bytearray(size)
+        found = []
+        for row in matched:
+            while row != NO_PARENT and not shown[enter[row]]:
+                shown[enter[row]] = 1
+                found.append(enter[row])
+                row = parent[row]
+        # Sorting a few positions beats scanning the whole flag array.
+        if len(found) * 16 < size:
+            return array("i", sorted(found))
+        return array("i", compress(range(size), shown))
+
+    def stream(self, search, filters, limit, after=-1, budget=None):
+        """
+        Finds the next page of a query by scanning the preorder, without
+        computing the other matches.
+
+        Ancestors come before their descendants in preorder, so the ancestors
+        of a match that no earlier page has sent all lie after the last
+        position sent.
+
+        Args:
+            search (str): Name or number text.
+            filters (dict): Grid column field to accepted display values.
+            limit (int): Page size.
+            after (int): Preorder position of the last row sent, -1 for none.
+            budget (int): Positions to scan before giving up; None for no
+                limit.
+
+        Returns:
+            tuple: The positions of the page and whether more follow, or None
+                if the budget ran out first.
+        """
+        matches = self.matcher(search, filters)
+        order = self.hierarchy.order
+        enter = self.hierarchy.enter
+        parent = self.hierarchy.parent
+        found = []
+        last = after
+        end = len(order) if budget is None else min(len(order), after + 1 + budget)
+        for position in range(after + 1, end):
+            row = order[position]
+            if not matches(row):
+                continue
+            chain = [position]
+            ancestor = parent[row]
+            while ancestor != NO_PARENT and enter[ancestor] > last:
+                chain.append(enter[ancestor])
+                ancestor = parent[ancestor]
+            for shown in reversed(chain):
+                if len(found) == limit:
+                    return found, True
+                found.append(shown)
+                last = shown
+        if end < len(order):
+            return None
+        return found, False
+
+    def query_key(self, search, filters):
+        query = json.dumps(
+            [search, sorted((field, sorted(values)) for field, values in filters.items())]
+        )
+        return hashlib.sha256(query.encode("utf-8")).hexdigest()[:16]
+
+    def cached_positions(self, key, search, filters):
+        with self.results_lock:
+            positions = self.results.get(key)
+            if positions is not None:
+                self.results.move_to_end(key)
+                return positions
+        positions = self.positions(search, filters)
+        with self.results_lock:
+            self.results[key] = positions
+            if len(self.results) > self.cache_size:
+                self.results.popitem(last=False)
+        return positions
+
+    def item(self, row):
+        """
+        Returns an account as the grid shows it.
+
+        Args:
+            row (int): The row of the account.
+
+        Returns:
+            dict: The account fields, plus its tree depth and the Attribute
+                and ARK Transaction labels.
+        """
+        item = self.store.row(row)
+        item["depth"] = self.hierarchy.depth[row]
+        for field, labels in self.labels.items():
+            item[field] = labels.get(item.get(FILTER_FIELDS[field]), "")
+        return item
+
+    def page(self, search="", filters=None, limit=100, cursor=None):
+        """
+        Returns one page of the accounts a query shows.
+
+        Args:
+            search (str): Name or number text; empty for no search.
+            filters (dict): Grid column field to accepted display values.
+            limit (int): Page size.
+            cursor (str): The nextCursor of the previous page, None for the
+                first one.
+
+        Raises:
+            KeyError: If a filter column cannot be filtered.
+            ValueError: If the cursor is malformed or belongs to another query.
+
+        Returns:
+            dict: items, total (None for a streamed query, whose total is
+                never computed) and nextCursor (None on the last page).
+        """
+        filters = filters or {}
+        unknown = set(filters) - set(FILTER_FIELDS)
+        if unknown:
+            raise KeyError(f"Cannot filter on {', '.join(sorted(unknown))}")
+        key = self.query_key(search, filters)
+        after = -1
+        if cursor:
+            try:
+                cursor_key, after = json.loads(base64.urlsafe_b64decode(cursor))
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"Malformed cursor: {cursor}") from e
+            if cursor_key != key or not isinstance(after, int):
+                raise ValueError("The cursor belongs to another query")
+        streamed = None
+        with self.results_lock:
+            cached = key in self.results
+        if not cached:
+            size = len(self.store)
+            estimate = max(self.estimate(search, filters), 1)
+            # A streamed page scans about limit * size / matches positions,
+            # computing the query costs about one step per match.
+            if estimate * estimate > limit * size:
+                budget = STREAM_SLACK * limit * size // estimate
+                streamed = self.stream(search, filters, limit, after, budget)
+        if streamed is not None:
+            shown, more = streamed
+            total = None
+        else:
+            positions = self.cached_positions(key, search, filters)
+            start = bisect_right(positions, after)
+            end = min(start + limit, len(positions))
+            shown = positions[start:end]
+            more = end < len(positions)
+            total = len(positions)
+        order = self.hierarchy.order
+        next_cursor = None
+        if more:
+            next_cursor = base64.urlsafe_b64encode(
+                json.dumps([key, shown[-1]]).encode("utf-8")
+            ).decode("ascii")
+        return {
+            "items": [self.item(order[position]) for position in shown],
+            "total": total,
+            "nextCursor": next_cursor,
+        }
+
+
+def benchmark(chart, queries, limit=100, repeat=5):
+    """
+    Times the first and the second page of queries against a chart.
+
+    Args:
+        chart (FundChart): The chart.
+        queries (list): (search, filters) pairs.
+        limit (int): Page size.
+        repeat (int): Runs per query; cached results are dropped before each.
+
+    Returns:
+        list: Per query, the median milliseconds of the first page, the
+            second page and the first page again.
+    """
+    report = []
+    for search, filters in queries:
+        timings = []
+        for _ in range(repeat):
+            with chart.results_lock:
+                chart.results.clear()
+            start = time.perf_counter()
+            first = chart.page(search, filters, limit)
+            first_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            if first["nextCursor"]:
+                chart.page(search, filters, limit, first["nextCursor"])
+            next_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            chart.page(search, filters, limit)
+            again_ms = (time.perf_counter() - start) * 1000
+            timings.append((first_ms, next_ms, again_ms))
+        report.append(tuple(statistics.median(column) for column in zip(*timings)))
+    return report
+
+
+if __name__ == "__main__":
+    import snapshot
+
+    parser = argparse.ArgumentParser(description="Time stand-in queries on a snapshot.")
+    parser.add_argument("snapshot", help=f"Snapshot file (*{snapshot.SUFFIX})")
+    parser.add_argument("--search", action="append", default=[], help="Search text")
+    parser.add_argument("--state", action="append", default=[], help="Status filter value")
+    arguments = parser.parse_args()
+    with snapshot.SnapshotStore(arguments.snapshot) as store:
+        start = time.perf_counter()
+        chart = FundChart(store, fund_id=store.value("fundId", 0))
+        chart.filter_values()
+        print(f"Opened {len(store)} accounts in {time.perf_counter() - start:.2f}s")
+        queries = [("", {})]
+        queries += [(search, {}) for search in arguments.search]
+        queries += [("", {"state": [state]}) for state in arguments.state]
+        print(f"{'query':>30} {'first':>9} {'next':>9} {'again':>9}")
+        for (search, filters), timings in zip(queries, benchmark(chart, queries)):
+            label = search or (json.dumps(filters) if filters else "(all)")
+            print(f"{label[:30]:>30} " + " ".join(f"{ms:>7.1f}ms" for ms in timings))
@@ -0,0 +1,141 @@
+import pytest
+import snapshot
+import synthetic_coa
+from coa_store import ChartOfAccountsStore
+from stand_in_backend import FundChart
+from stand_in_server import ATTRIBUTE_LABELS, ARK_TRANSACTION_LABELS
+
+QUERIES = [
+    ("", {}),
+    ("Cash", {}),
+    ("1", {}),
+    ("no such account", {}),
+    ("", {"state": ["DRAFT"]}),
+    ("", {"isEntityRequired": ["Yes"]}),
+    ("", {"attribute": ["Asset - Balance Sheet"]}),
+    ("", {"arkTransaction": ["General Expense", "Cash Transfer"]}),
+    ("Expense", {"doNotMap": ["No"]}),
+]
+LABELS = {"attribute": ATTRIBUTE_LABELS, "arkTransaction": ARK_TRANSACTION_LABELS}
+
+
+@pytest.fixture(scope="module")
+def store():
+    items = synthetic_coa.ChartProfile.learn().generate(20_000, funds=2, seed=1)
+    return ChartOfAccountsStore.from_items(items)
+
+
+@pytest.fixture(scope="module")
+def mapped(store, tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("chart") / f"chart{snapshot.SUFFIX}")
+    snapshot.write(path, store)
+    with snapshot.SnapshotStore(path) as mapped:
+        yield mapped
+
+
+def chart_of(store, fund_id):
+    return FundChart(store, ATTRIBUTE_LABELS, ARK_TRANSACTION_LABELS, fund_id=fund_id)
+
+
+def shown(item, field):
+    if field in LABELS:
+        value = item.get("attributeId")
+        return LABELS[field].get(value, value)
+    if isinstance(item[field], bool):
+        return "Yes" if item[field] else "No"
+    return item[field]
+
+
+def expected_ids(store, fund_id, search, filters):
+    """Every account of the fund the query shows, in tree order, by brute force."""
+    matched = set()
+    for row in range(len(store)):
+        item = store.row(row)
+        if item["fundId"] != fund_id:
+            continue
+        keys = (item.get("name") or "").casefold(), str(item["number"])
+        if search and not any(search.casefold() in key for key in keys):
+            continue
+        if all(shown(item, field) in accepted for field, accepted in filters.items()):
+            matched.add(row)
+    hierarchy = store.build_hierarchy()
+    for row in list(matched):
+        matched.update(hierarchy.path_to_root(row))
+    return [store.value("id", row) for row in sorted(matched, key=hierarchy.enter.__getitem__)]
+
+
+def all_pages(chart, search, filters, limit):
+    ids = []
+    cursor = None
+    while True:
+        page = chart.page(search, filters, limit, cursor)
+        assert len(page["items"]) <= limit
+        ids += [item["id"] for item in page["items"]]
+        cursor = page["nextCursor"]
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize("search, filters", QUERIES)
+def test_pages_match_brute_force(store, mapped, search, filters):
+    fund_id = store.value("fundId", 0)
+    expected = expected_ids(store, fund_id, search, filters)
+    assert all_pages(chart_of(mapped, fund_id), search, filters, 100) == expected
+    assert all_pages(chart_of(store, fund_id), search, filters, 37) == expected
+
+
+def test_funds_are_kept_apart(store, mapped):
+    funds = list(dict.fromkeys(store.value("fundId", row) for row in range(len(store))))
+    assert len(funds) == 2
+    for fund_id in funds:
+        chart = chart_of(mapped, fund_id)
+        ids = all_pages(chart, "", {}, 1000)
+        assert len(ids) == sum(
+            store.value("fundId", row) == fund_id for row in range(len(store))
+        )
+        assert {mapped.value("fundId", mapped.row_of_id(i)) for i in ids} == {fund_id}
+    with pytest.raises(ValueError):
+        chart_of(mapped, "no such fund")
+
+
+def test_cursor_errors(mapped):
+    chart = chart_of(mapped, mapped.value("fundId", 0))
+    cursor = chart.page("Cash", {}, 10)["nextCursor"]
+    with pytest.raises(ValueError):
+        chart.page("Bank", {}, 10, cursor)
+    with pytest.raises(ValueError):
+        chart.page("Cash", {}, 10, "not a cursor")
+    with pytest.raises(KeyError):
+        chart.page("", {"number": ["1"]})
+
+
+def test_filter_values_are_the_funds(store, mapped):
+    fund_id = store.value("fundId", 0)
+    values = chart_of(mapped, fund_id).filter_values()
+    rows = [row for row in range(len(store)) if store.value("fundId", row) == fund_id]
+    assert values["state"] == sorted({store.value("state", row) for row in rows})
+    assert values["attribute"] == sorted({shown(store.row(row), "attribute") for row in rows})
+
+
+def test_charts_build_nothing_up_front(mapped):
+    chart = chart_of(mapped, mapped.value("fundId", 0))
+    assert chart.built == {}
+    for name, column in mapped.hierarchy_arrays.items():
+        assert getattr(chart.hierarchy, name) is column
+    assert chart.search_index.postings is mapped.search_postings
+
+
+def test_broad_queries_are_streamed(mapped):
+    chart = chart_of(mapped, mapped.value("fundId", 0))
+    broad = chart.page("", {"state": ["DRAFT"]}, 100)
+    assert broad["total"] is None
+    assert broad["nextCursor"] is not None
+    assert not chart.results
+    rarest = min(
+        mapped.distinct("fsDisplayName"),
+        key=lambda value: len(mapped.rows_where("fsDisplayName", value)),
+    )
+    filters = {"fsDisplayName": [rarest]}
+    selective = chart.page("", filters, 100)
+    assert selective["total"] == len(chart.positions("", filters)) > 0
+    assert len(chart.results) == 1
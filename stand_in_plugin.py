@@ -0,0 +1,33 @@
+import os
+from stand_in_server import serve, STAND_IN_USERNAME, STAND_IN_PASSWORD
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--stand-in",
+        action="store_true",
+        help="run against a local stand-in app backed by mock_data instead of BASE_URL",
+    )
+
+
+def pytest_configure(config):
+    # Only the controller starts the server; xdist workers inherit its URL
+    # through the environment.
+    if not config.getoption("stand_in") or hasattr(config, "workerinput"):
+        return
+    server = serve(username=STAND_IN_USERNAME, password=STAND_IN_PASSWORD)
+    os.environ.update(
+        BASE_URL=server.url,
+        AUTH_URL=f"{server.url}/api/auth/login",
+        USERNAME_TEST=STAND_IN_USERNAME,
+        PASSWORD_TEST=STAND_IN_PASSWORD,
+        STAND_IN="1",
+    )
+    config.stand_in_server = server
+
+
+def pytest_unconfigure(config):
+    server = getattr(config, "stand_in_server", None)
+    if server is not None:
+        server.shutdown()
+        server.server_close()
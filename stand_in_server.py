@@ -0,0 +1,322 @@
+import os
+import json
+import uuid
+import threading
+from urllib.parse import urlsplit, parse_qs, unquote
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from dotenv import load_dotenv
+import dataset
+import snapshot
+from coa_store import MISSING, ChartOfAccountsStore
+from stand_in_backend import FundChart
+from constants import CLIENT_NAME, FUND_NAME
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stand_in_app.html")
+STAND_IN_USERNAME = "stand-in@example.com"
+STAND_IN_PASSWORD = "stand-in"
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# The mock data has no attribute names or ARK transaction types, so the
+# stand-in derives both from the attributeId (one per account category). The
+# oracle uses the same tables in stand-in runs, so every column filter has an
+# exact expectation.
+# attributeId -> label shown in the Attribute column of the stand-in grid.
+ATTRIBUTE_LABELS = {
+    "4ebb2c7b-eb7e-11ed-9a6e-0a3efd619f29": "Asset - Balance Sheet",
+    "4ee3a827-eb7e-11ed-9a6e-0a3efd619f29": "Liability - Balance Sheet",
+    "4f0a82b7-eb7e-11ed-9a6e-0a3efd619f29": "Equity - Balance Sheet",
+    "4f317bad-eb7e-11ed-9a6e-0a3efd619f29": "Income - Income Statement",
+    "4f5dd0ce-eb7e-11ed-9a6e-0a3efd619f29": "Expense - Income Statement",
+    "4f8a1a57-eb7e-11ed-9a6e-0a3efd619f29": "Gain/Loss - Income Statement",
+}
+# attributeId -> type shown in the ARK Transaction column of the stand-in grid.
+ARK_TRANSACTION_LABELS = {
+    "4ebb2c7b-eb7e-11ed-9a6e-0a3efd619f29": "Cash Transfer",
+    "4ee3a827-eb7e-11ed-9a6e-0a3efd619f29": "Accrued Liability",
+    "4f0a82b7-eb7e-11ed-9a6e-0a3efd619f29": "Capital Activity",
+    "4f317bad-eb7e-11ed-9a6e-0a3efd619f29": "Investment Income",
+    "4f5dd0ce-eb7e-11ed-9a6e-0a3efd619f29": "General Expense",
+    "4f8a1a57-eb7e-11ed-9a6e-0a3efd619f29": "Realized Gain/Loss",
+}
+
+
+def clients_of(fund_ids):
+    """
+    Lists the clients and funds the stand-in app offers.
+
+    The first fund is named FUND_NAME and belongs to CLIENT_NAME; any other
+    fund is numbered. A second client without funds keeps the autocomplete
+    from having a single option.
+
+    Args:
+        fund_ids (list): The fund ids, in order.
+
+    Returns:
+        list: The clients, as dicts with their funds.
+    """
+    funds = [
+        {"id": fund_id, "name": FUND_NAME if index == 0 else f"Fund {index + 1}"}
+        for index, fund_id in enumerate(fund_ids)
+    ]
+    return [
+        {"id": "1", "name": CLIENT_NAME, "funds": funds},
+        {"id": "2", "name": "Stand-in Holdings", "funds": []},
+    ]
+
+
+def build_clients(items):
+    """
+    Indexes accounts into the clients and funds the stand-in app offers.
+
+    Accounts are consumed one at a time into a columnar store per fund, so
+    large charts are never held as dicts.
+
+    Args:
+        items (iterable): The account dicts.
+
+    Returns:
+        tuple: The clients (list of dicts with their funds) and the FundChart
+            of each fund id.
+    """
+    stores = {}
+    for item in items:
+        store = stores.get(item["fundId"])
+        if store is None:
+            store = stores[item["fundId"]] = ChartOfAccountsStore()
+        store.append(item)
+    charts = {}
+    for fund_id, store in stores.items():
+        store.build_sorted_index()
+        charts[fund_id] = FundChart(store, ATTRIBUTE_LABELS, ARK_TRANSACTION_LABELS)
+    return clients_of(list(charts)), charts
+
+
+def open_snapshot(path):
+    """
+    Serves every fund of a snapshot from the one mapped store, with nothing
+    to parse or index.
+
+    Args:
+        path (str): The snapshot (*.coas).
+
+    Returns:
+        tuple: The clients, in the order the funds first appear, and the
+            FundChart of each fund id.
+    """
+    store = snapshot.SnapshotStore(path)
+    funds = store.strings["fundId"]
+    fund_ids = [
+        funds.decode(code) for code in dict.fromkeys(funds.codes) if code != MISSING
+    ]
+    charts = {
+        fund_id: FundChart(store, ATTRIBUTE_LABELS, ARK_TRANSACTION_LABELS, fund_id=fund_id)
+        for fund_id in fund_ids
+    }
+    return clients_of(fund_ids), charts
+
+
+def load(server, items, path):
+    try:
+        if items is None and path and path.endswith(snapshot.SUFFIX):
+            server.clients, server.charts = open_snapshot(path)
+        else:
+            server.clients, server.charts = build_clients(
+                dataset.stream(path) if items is None else items
+            )
+    except Exception as e:
+        server.load_error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        server.loaded.set()
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Serves a local stand-in for the app the tests talk to.
+
+    Endpoints:
+        POST /api/auth/login: Checks email/password, returns a token and a
+            session cookie.
+        GET /api/auth/me: Returns the user for a valid token or cookie.
+        GET /api/clients?search=: Clients whose name contains the text.
+        GET /api/clients/<id>/funds: The funds of a client.
+        GET /api/funds/<id>/accounts?search=&filter.<column>=&limit=&cursor=:
+            One page of the accounts matching a search and column filters,
+            with their ancestors, in tree order. Repeat filter.<column> for
+            each accepted value; pass the returned nextCursor for the next
+            page.
+        GET /api/funds/<id>/filters: The values each column can be
+            filtered on.
+        GET anything else: The single-page app (stand_in_app.html), which
+            renders the login form, the client selector, the sidebar menus
+            and the grid with the ids the tests use.
+
+    The accounts load in the background, so the login form and the app are
+    served at once; the client and fund endpoints wait for the load and
+    answer 503 if it failed.
+    """
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            return json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return {}
+
+    def current_user(self):
+        tokens = self.server.tokens
+        bearer = self.headers.get("Authorization", "")
+        if bearer.startswith("Bearer ") and bearer[7:] in tokens:
+            return tokens[bearer[7:]]
+        for part in self.headers.get("Cookie", "").split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == "session" and value in tokens:
+                return tokens[value]
+        return None
+
+    def do_POST(self):
+        if self.path == "/api/auth/login":
+            body = self.read_json()
+            credentials = (body.get("email"), body.get("password"))
+            if credentials != (self.server.username, self.server.password):
+                self.send_json(401, {"error": "invalid credentials"})
+                return
+            token = uuid.uuid4().hex
+            self.server.tokens[token] = body["email"]
+            self.send_json(
+                200,
+                {"token": token},
+                {"Set-Cookie": f"session={token}; Path=/; HttpOnly"},
+            )
+            return
+        self.send_json(404, {"error": "not found"})
+
+    def send_app(self):
+        with open(APP_PATH, "rb") as file:
+            payload = file.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def send_page(self, chart, query):
+        filters = {
+            name[len("filter.") :]: values
+            for name, values in query.items()
+            if name.startswith("filter.")
+        }
+        try:
+            limit = min(max(int(query.get("limit", [PAGE_SIZE])[0]), 1), MAX_PAGE_SIZE)
+            page = chart.page(
+                query.get("search", [""])[0],
+                filters,
+                limit,
+                query.get("cursor", [None])[0],
+            )
+        except (KeyError, ValueError) as e:
+            self.send_json(400, {"error": str(e).strip("'")})
+            return
+        self.send_json(200, page)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        parts = [unquote(part) for part in url.path.strip("/").split("/")]
+        if parts[0] != "api":
+            self.send_app()
+            return
+        user = self.current_user()
+        if user is None:
+            self.send_json(401, {"error": "not logged in"})
+            return
+        if parts == ["api", "auth", "me"]:
+            self.send_json(200, {"email": user})
+            return
+        self.server.loaded.wait()
+        if self.server.load_error:
+            self.send_json(503, {"error": f"accounts failed to load: {self.server.load_error}"})
+        elif parts == ["api", "clients"]:
+            search = parse_qs(url.query).get("search", [""])[0].casefold()
+            self.send_json(
+                200,
+                [
+                    {"id": client["id"], "name": client["name"]}
+                    for client in self.server.clients
+                    if search in client["name"].casefold()
+                ],
+            )
+        elif len(parts) == 4 and parts[:2] == ["api", "clients"] and parts[3] == "funds":
+            for client in self.server.clients:
+                if client["id"] == parts[2]:
+                    self.send_json(200, client["funds"])
+                    return
+            self.send_json(404, {"error": "unknown client"})
+        elif len(parts) == 4 and parts[:2] == ["api", "funds"]:
+            chart = self.server.charts.get(parts[2])
+            if chart is None:
+                self.send_json(404, {"error": "unknown fund"})
+            elif parts[3] == "accounts":
+                self.send_page(chart, parse_qs(url.query, keep_blank_values=True))
+            elif parts[3] == "filters":
+                self.send_json(200, chart.filter_values())
+            else:
+                self.send_json(404, {"error": "not found"})
+        else:
+            self.send_json(404, {"error": "not found"})
+
+
+def serve(host="127.0.0.1", port=0, username=None, password=None, items=None):
+    """
+    Starts the stand-in server on a background thread.
+
+    The accounts are loaded on another thread, so the call returns as soon
+    as the port is bound; server.loaded is set once they are in.
+
+    Args:
+        host (str): Interface to bind.
+        port (int): Port to bind; 0 picks a free one.
+        username (str): Accepted email. Defaults to USERNAME_TEST.
+        password (str): Accepted password. Defaults to PASSWORD_TEST.
+        items (iterable): The accounts served. Defaults to CHART_PATH (an
+            NDJSON export or a snapshot), or mock_data if that is unset.
+
+    Returns:
+        ThreadingHTTPServer: The running server; its URL is server.url.
+    """
+    load_dotenv()
+    server = ThreadingHTTPServer((host, port), StandInHandler)
+    server.daemon_threads = True
+    server.username = username or os.getenv("USERNAME_TEST")
+    server.password = password or os.getenv("PASSWORD_TEST")
+    server.tokens = {}
+    server.clients, server.charts = [], {}
+    server.loaded = threading.Event()
+    server.load_error = None
+    server.url = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(
+        target=load, args=(server, items, os.getenv("CHART_PATH")), daemon=True
+    ).start()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    port = int(os.getenv("STAND_IN_PORT", "8000"))
+    server = serve(port=port)
+    print(f"Stand-in server running at {server.url}")
+    threading.Event().wait()
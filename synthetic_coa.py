@@ -0,0 +1,223 @@
+import math
+import uuid
+import random
+import argparse
+from collections import Counter
+import ndjson
+import dataset
+
+POST_DATE = "2024-03-14T12:38:11Z"
+
+
+class GroupTemplate:
+    """
+    The shape of one top-level group of the source chart.
+
+    Args:
+        category (str): Leading digit of the group's numbers.
+        name (str): Name of the group account.
+        fs_display_name (str): fsDisplayName shared by the whole group.
+        attribute_id (str): attributeId shared by the whole group.
+        fan_outs (list): Per depth, the child counts of the group's accounts
+            at that depth.
+        names (list): Names of the accounts below the group account.
+    """
+
+    def __init__(self, category, name, fs_display_name, attribute_id, fan_outs, names):
+        self.category = category
+        self.name = name
+        self.fs_display_name = fs_display_name
+        self.attribute_id = attribute_id
+        self.fan_outs = fan_outs
+        self.names = names
+
+
+class ChartProfile:
+    """
+    The statistics of a chart of accounts that synthetic charts reproduce.
+
+    Each top-level group becomes a template, drawn uniformly, so the category
+    (leading digit) weights and fsDisplayName frequencies carry over. Below
+    the group account the child counts are resampled per depth from the
+    template's own, so groups keep their size and depth without being copies.
+    States, flags, and the presence of attributeId and fsMappingId are drawn
+    from their overall ratios.
+    """
+
+    def __init__(self, templates, states, flags, attribute_rate, mapping_rate):
+        self.templates = templates
+        self.states = states
+        self.flags = flags
+        self.attribute_rate = attribute_rate
+        self.mapping_rate = mapping_rate
+        # Digits of the child index at each depth, wide enough for the
+        # largest fan-out seen there (two at least, as in mock_data).
+        self.widths = []
+        for template in templates:
+            for depth, counts in enumerate(template.fan_outs):
+                width = max(2, len(str(max(counts))))
+                if depth == len(self.widths):
+                    self.widths.append(width)
+                self.widths[depth] = max(self.widths[depth], width)
+        self.min_group_size = min(self.group_size(template) for template in templates)
+
+    @staticmethod
+    def group_size(template):
+        return 1 + sum(sum(counts) for counts in template.fan_outs)
+
+    @classmethod
+    def learn(cls, items=None):
+        """
+        Learns a profile from account dicts.
+
+        Args:
+            items (list): The accounts, mock_data's by default.
+
+        Raises:
+            ValueError: If the accounts have no top-level group.
+
+        Returns:
+            ChartProfile: The profile.
+        """
+        items = dataset.items() if items is None else items
+        children = {}
+        for item in items:
+            children.setdefault(item.get("parentId"), []).append(item)
+        templates = []
+        for root in children.get(None, []):
+            fan_outs = []
+            names = []
+            level = [root]
+            while level:
+                below = [children.get(item["id"], []) for item in level]
+                if not any(below):
+                    break
+                fan_outs.append([len(accounts) for accounts in below])
+                level = [account for accounts in below for account in accounts]
+                names.extend(account["name"] for account in level)
+            templates.append(
+                GroupTemplate(
+                    str(root["number"])[0],
+                    root["name"],
+                    root.get("fsDisplayName"),
+                    root.get("attributeId"),
+                    fan_outs,
+                    names,
+                )
+            )
+        if not templates:
+            raise ValueError("The chart has no top-level accounts")
+        flags = {
+            field: sum(bool(item.get(field)) for item in items) / len(items)
+            for field in ("isTaxable", "isEntityRequired", "doNotMap")
+        }
+        return cls(
+            templates,
+            Counter(item["state"] for item in items),
+            flags,
+            sum(item.get("attributeId") is not None for item in items) / len(items),
+            sum(item.get("fsMappingId") is not None for item in items) / len(items),
+        )
+
+    def generate(self, accounts, funds=1, seed=0):
+        """
+        Streams a synthetic chart, one account at a time.
+
+        Only the group being generated is held in memory, so any size can be
+        written to disk. Accounts come in preorder, parents before children,
+        and the same seed always yields the same chart.
+
+        Args:
+            accounts (int): Total number of accounts, split evenly over funds.
+            funds (int): Number of funds, each a chart of its own.
+            seed (int): Seed of the random generator.
+
+        Yields:
+            dict: An account, in the mock_data format.
+        """
+        rng = random.Random(seed)
+        states = list(self.states)
+        state_weights = list(self.states.values())
+        for fund in range(funds):
+            fund_id = self._uuid(rng)
+            remaining = accounts // funds + (fund < accounts % funds)
+            group_width = max(2, len(str(math.ceil(remaining / self.min_group_size))))
+            next_group = Counter()
+            while remaining > 0:
+                template = rng.choice(self.templates)
+                next_group[template.category] += 1
+                prefix = f"{template.category}{next_group[template.category]:0{group_width}d}"
+                for item in self._group(rng, template, fund_id, prefix, states, state_weights):
+                    yield item
+                    remaining -= 1
+                    if not remaining:
+                        break
+
+    def _group(self, rng, template, fund_id, prefix, states, state_weights):
+        root_id = self._uuid(rng)
+        # (id, parentId, child index at each depth, depth)
+        stack = [(root_id, None, [], 0)]
+        while stack:
+            account_id, parent_id, path, depth = stack.pop()
+            digits = path + [0] * (len(self.widths) - len(path))
+            state = rng.choices(states, state_weights)[0]
+            item = {
+                "id": account_id,
+                "fundId": fund_id,
+                "number": int(prefix + "".join(
+                    f"{index:0{width}d}" for index, width in zip(digits, self.widths)
+                )),
+                "name": template.name if parent_id is None else rng.choice(template.names),
+                "state": state,
+                "parentId": parent_id,
+                "description": "",
+            }
+            for field, rate in self.flags.items():
+                item[field] = rng.random() < rate
+            if rng.random() < self.attribute_rate:
+                item["attributeId"] = template.attribute_id
+            if rng.random() < self.mapping_rate:
+                item["fsMappingId"] = root_id
+            item["fsDisplayName"] = template.fs_display_name
+            item["postDate"] = POST_DATE if state == "POSTED" else None
+            yield item
+            if depth == len(template.fan_outs):
+                continue
+            count = template.fan_outs[0][0] if depth == 0 else rng.choice(template.fan_outs[depth])
+            count = min(count, 10 ** self.widths[depth] - 1)
+            for index in range(count, 0, -1):
+                stack.append((self._uuid(rng), account_id, path + [index], depth + 1))
+
+    @staticmethod
+    def _uuid(rng):
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def write(path, accounts, funds=1, seed=0, profile=None):
+    """
+    Writes a synthetic chart to disk as JSON lines, one account per line
+    (gzipped if path ends in .gz).
+
+    Args:
+        path (str): The output file.
+        accounts (int): Total number of accounts.
+        funds (int): Number of funds.
+        seed (int): Seed of the random generator.
+        profile (ChartProfile): The profile, learned from mock_data by default.
+
+    Returns:
+        int: The number of accounts written.
+    """
+    profile = profile or ChartProfile.learn()
+    return ndjson.write(path, profile.generate(accounts, funds, seed))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic chart of accounts.")
+    parser.add_argument("accounts", type=int, help="Total number of accounts")
+    parser.add_argument("output", help="Output file (JSON lines, .gz to compress)")
+    parser.add_argument("--funds", type=int, default=1, help="Number of funds")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    arguments = parser.parse_args()
+    count = write(arguments.output, arguments.accounts, arguments.funds, arguments.seed)
+    print(f"Wrote {count} accounts to {arguments.output}")
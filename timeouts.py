@@ -0,0 +1,137 @@
+import os
+import json
+import math
+import time
+import logging
+import fasteners
+
+HISTORY_PATH = ".timing_history.json"
+
+
+class AdaptiveTimeouts:
+    """
+    Derives per-step timeouts from the durations observed in earlier runs.
+
+    A step's timeout is its p99 duration times a safety factor, clamped
+    between a floor and a ceiling. Until a step has enough samples, the
+    hard-coded default is used.
+
+    Steps share one history per name, so waits of very different cost need
+    different names: e.g. "grid" for a check of the grid already shown, but
+    "grid_after_reload" for the wait after sb.refresh().
+
+    Args:
+        path (str): JSON file holding the history, shared by all workers.
+        safety_factor (float): Multiplier applied to the p99 duration.
+        floor (float): Minimum timeout in seconds.
+        ceiling (float): Maximum timeout in seconds.
+        min_samples (int): Samples needed before the history is trusted.
+        max_samples (int): Samples kept per step; older ones are dropped.
+        logger (logging.Logger): Where derived timeouts are logged.
+    """
+
+    def __init__(
+        self,
+        path=HISTORY_PATH,
+        safety_factor=2.0,
+        floor=1.0,
+        ceiling=30.0,
+        min_samples=5,
+        max_samples=200,
+        logger=None,
+    ):
+        self.path = path
+        self.safety_factor = safety_factor
+        self.floor = floor
+        self.ceiling = ceiling
+        self.min_samples = min_samples
+        self.max_samples = max_samples
+        self.log = logger or logging.getLogger(__name__)
+        self.lock = fasteners.InterProcessLock(path + ".lock")
+        self.history = self._load()
+        self.pending = {}
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as file:
+                return json.load(file)
+        except (OSError, ValueError) as e:
+            self.log.warning(f"Ignoring unreadable timing history {self.path}: {e}")
+            return {}
+
+    def record(self, step, seconds):
+        """
+        Records how long a step waited.
+
+        Args:
+            step (str): The step name.
+            seconds (float): The observed wait duration.
+
+        Returns:
+            None
+        """
+        self.pending.setdefault(step, []).append(round(seconds, 3))
+
+    def timeout_for(self, step, default):
+        """
+        Returns the timeout to use for a step.
+
+        Args:
+            step (str): The step name.
+            default (float): The timeout used while there is too little history.
+
+        Returns:
+            float: The timeout in seconds.
+        """
+        samples = self.history.get(step, []) + self.pending.get(step, [])
+        if len(samples) < self.min_samples:
+            return default
+        ordered = sorted(samples)
+        p99 = ordered[math.ceil(0.99 * len(ordered)) - 1]
+        timeout = min(max(p99 * self.safety_factor, self.floor), self.ceiling)
+        self.log.debug(f"Timeout for {step}: {timeout:.2f}s (p99 {p99:.2f}s)")
+        return timeout
+
+    def wait_visible(self, sb, step, selector, default=10):
+        """
+        Waits for an element using the adaptive timeout of a named step and
+        records how long it took.
+
+        Args:
+            sb (BaseCase): The SeleniumBase test case driving the browser.
+            step (str): The step name the duration is recorded under.
+            selector (str): The element selector.
+            default (float): Timeout used until the step has enough history.
+
+        Returns:
+            WebElement: The visible element.
+        """
+        start = time.monotonic()
+        element = sb.wait_for_element_visible(
+            selector, timeout=self.timeout_for(step, default)
+        )
+        self.record(step, time.monotonic() - start)
+        return element
+
+    def save(self):
+        """
+        Merges the samples recorded in this process into the history file.
+
+        Returns:
+            None
+        """
+        if not self.pending:
+            return
+        with self.lock:
+            history = self._load()
+            for step, samples in self.pending.items():
+                merged = history.get(step, []) + samples
+                history[step] = merged[-self.max_samples :]
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as file:
+                json.dump(history, file, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        self.history = history
+        self.pending = {}